@@ -0,0 +1,208 @@
+"""Automation rules: threshold triggers scheduled by predicted crossing time."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+import heapq
+import math
+from Constants import AutomationConstants
+
+
+@dataclass
+class RuleStats:
+    """Per-rule counters."""
+    evaluations: int = 0
+    firings: int = 0
+    failures: int = 0  # Condition held but the action didn't resolve it (usually not enough money)
+    last_fired: Optional[float] = None
+
+
+class Rule(ABC):
+    """Base class for an automation rule; subclasses implement check() and fire().
+
+    A rule is checked per target: a land with a coop, or None for rules about the whole
+    farm. predict() returns how many seconds until the condition could first hold, or
+    math.inf if it can't with the current rates. The estimate must never be later than the
+    real crossing time while the rates it read stay unchanged; anything that can change
+    them (player actions, rule actions, weather refreshes) reschedules every rule.
+    """
+    # Game events that make this rule due immediately (see RuleEngine.wake)
+    wake_on = frozenset()
+
+    def __init__(self, name):
+        self.name = name
+        self.enabled = True
+        self.stats = RuleStats()
+
+    def targets(self, game):
+        return [None]
+
+    def predict(self, game, target):
+        return 0.0
+
+    @abstractmethod
+    def check(self, game, target):
+        """Return True if the rule's condition holds for target."""
+
+    @abstractmethod
+    def fire(self, game, target):
+        """Take the rule's action for target. Returns True if it changed the game."""
+
+
+class FeedBelowRule(Rule):
+    """Buy a bag of feed for any coop whose feed level drops below threshold %."""
+
+    def __init__(self, threshold=AutomationConstants.AUTO_FEED_THRESHOLD):
+        super().__init__(f"Feed < {threshold:.0f}% -> buy feed")
+        self.threshold = threshold
+
+    def targets(self, game):
+        return [land for land in game.lands if land.coop]
+
+    def predict(self, game, land):
+        coop = land.coop
+        if coop.feed_level <= self.threshold:
+            return 0.0
+        burn_per_second = len(coop.chickens) * coop.coop_type.breed.feed_per_second
+        if burn_per_second <= 0:
+            return math.inf
+        return (coop.feed_level - self.threshold) / burn_per_second
+
+    def check(self, game, land):
+        return land.coop is not None and land.coop.feed_level < self.threshold
+
+    def fire(self, game, land):
+        return game.buy_feed(land)
+
+
+class EggsAboveRule(Rule):
+    """Sell all eggs once storage passes a fraction of egg_capacity."""
+
+    def __init__(self, fraction=AutomationConstants.AUTO_SELL_FRACTION):
+        super().__init__(f"Eggs > {fraction:.0%} capacity -> sell")
+        self.fraction = fraction
+
+    def predict(self, game, target):
+        remaining = game.egg_capacity * self.fraction - game.total_eggs
+        if remaining <= 0:
+            return 0.0
+        rate = sum(land.coop.get_total_production_rate() for land in game.lands if land.coop)
+        if rate <= 0:
+            return math.inf
+        return remaining / rate
+
+    def check(self, game, target):
+        return game.total_eggs > game.egg_capacity * self.fraction
+
+    def fire(self, game, target):
+        return game.sell_eggs()
+
+
+class CureBlightRule(Rule):
+    """Buy the blight cure when any coop has blight and money exceeds min_money."""
+    wake_on = frozenset({"blight"})
+
+    def __init__(self, min_money=AutomationConstants.AUTO_CURE_MIN_MONEY):
+        super().__init__(f"Blight -> cure if money > ${min_money:.0f}")
+        self.min_money = min_money
+
+    def predict(self, game, target):
+        # Blight onset is random; the blight wake event schedules this rule instead
+        if any(land.coop.blight_active for land in game.lands if land.coop):
+            return 0.0
+        return math.inf
+
+    def check(self, game, target):
+        return game.money > self.min_money and any(land.coop.blight_active for land in game.lands if land.coop)
+
+    def fire(self, game, target):
+        return game.buy_blight_cure()
+
+
+class RuleEngine:
+    """Evaluates rules only when their thresholds could have been crossed.
+
+    Every (rule, target) pair is a heap entry keyed by its predicted crossing time in game
+    seconds. Each tick pops the due entries, up to max_evaluations_per_tick; the rest stay
+    due for the next tick. A rule whose condition holds but can't be resolved retries after
+    RETRY_INTERVAL.
+    """
+
+    def __init__(self, max_evaluations_per_tick=AutomationConstants.MAX_EVALUATIONS_PER_TICK):
+        self.rules = []
+        self.max_evaluations_per_tick = max_evaluations_per_tick
+        self._heap = []  # (due_time, seq, rule, target)
+        self._seq = 0
+        self._dirty = False
+
+    def add_rule(self, rule):
+        self.rules.append(rule)
+        self._dirty = True
+
+    def remove_rule(self, rule):
+        self.rules.remove(rule)
+        self._dirty = True
+
+    def invalidate(self):
+        """Reschedule every rule on the next tick; call after anything that changes rates or stock."""
+        self._dirty = True
+
+    def wake(self, event, now):
+        """Make every rule listening for event due immediately."""
+        for rule in self.rules:
+            if event in rule.wake_on:
+                self._push(now, rule, None)
+
+    def _push(self, due, rule, target):
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, rule, target))
+
+    def _schedule(self, game, rule, target, now, min_delay=0.0):
+        delay = rule.predict(game, target)
+        if delay == math.inf:
+            return  # Can't cross until rates change; invalidate()/wake() will revisit
+        self._push(now + max(delay, min_delay), rule, target)
+
+    def _rebuild(self, game, now):
+        self._heap = []
+        for rule in self.rules:
+            if rule.enabled:
+                for target in rule.targets(game):
+                    self._schedule(game, rule, target, now)
+        self._dirty = False
+
+    def tick(self, game):
+        """Evaluate due rules. Returns the number of evaluations performed."""
+        now = game.game_time
+        if self._dirty:
+            self._rebuild(game, now)
+        evaluations = 0
+        while self._heap and self._heap[0][0] <= now and evaluations < self.max_evaluations_per_tick:
+            _, _, rule, target = heapq.heappop(self._heap)
+            if not rule.enabled:
+                continue
+            evaluations += 1
+            rule.stats.evaluations += 1
+            if not rule.check(game, target):
+                # Predictions ignore per-tick rounding, so don't re-check a near miss every tick
+                self._schedule(game, rule, target, now, AutomationConstants.MIN_RECHECK_INTERVAL)
+                continue
+            if rule.fire(game, target):
+                # The action may have changed rates other rules predicted from (a cure restores
+                # production), including pairs that were dropped as never crossing
+                self._dirty = True
+            if rule.check(game, target):
+                rule.stats.failures += 1
+                self._push(now + AutomationConstants.RETRY_INTERVAL, rule, target)
+            else:
+                rule.stats.firings += 1
+                rule.stats.last_fired = now
+                self._schedule(game, rule, target, now, AutomationConstants.MIN_RECHECK_INTERVAL)
+        return evaluations
+
+    def pending(self):
+        return len(self._heap)
+
+
+def default_rules():
+    """The preset rules installed by --automation."""
+    return [FeedBelowRule(), EggsAboveRule(), CureBlightRule()]
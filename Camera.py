@@ -1,35 +1,99 @@
 from Constants import ScreenDimensions, GameConstants
+import numpy as np
 
 class Camera:
     """Simple camera that transforms world coordinates to screen coordinates and back."""
     # Camera pan speed (world units per second)
     PAN_SPEED = 400
 
-    def __init__(self, x=0.0, y=0.0, zoom=2.0, ui_width=200):
+    def __init__(self, x=0.0, y=0.0, zoom=2.0, ui_width=200,
+                 width=ScreenDimensions.SCREEN_WIDTH, height=ScreenDimensions.SCREEN_HEIGHT):
         self.x = x
         self.y = y
         self.zoom = zoom
         self.ui_width = ui_width
+        # Size of the surface this camera renders to
+        self.width = width
+        self.height = height
+        # Cached affine transform, rebuilt only when the view parameters change
+        self._matrix_key = None
+        self._matrix = None
+        self._inverse = None
 
-    def world_to_screen(self, world_pos):
-        wx, wy = world_pos
+    def _view_key(self):
+        return (self.x, self.y, self.zoom, self.ui_width, self.width, self.height)
+
+    def _screen_center(self):
         # map world coordinates into left area (reserve ui_width on right)
-        available_width = ScreenDimensions.SCREEN_WIDTH - self.ui_width
+        available_width = self.width - self.ui_width
         screen_cx = available_width // 2
-        screen_cy = ScreenDimensions.SCREEN_HEIGHT // 2
+        screen_cy = self.height // 2
+        return screen_cx, screen_cy
+
+    def resize(self, width, height):
+        """Track a new window size; the view stays centred on the same world point."""
+        self.width = width
+        self.height = height
+
+    def scaled(self, scale):
+        """Return a camera showing the same view on a surface scale times this one's size."""
+        return Camera(self.x, self.y, self.zoom * scale, self.ui_width * scale,
+                      max(1, int(self.width * scale)), max(1, int(self.height * scale)))
+
+    def get_matrix(self):
+        """Return the 3x3 world->screen affine matrix, rebuilding it only if the view changed."""
+        key = self._view_key()
+        if key != self._matrix_key:
+            screen_cx, screen_cy = self._screen_center()
+            z = self.zoom
+            self._matrix = np.array([
+                [z, 0.0, screen_cx - self.x * z],
+                [0.0, z, screen_cy - self.y * z],
+                [0.0, 0.0, 1.0],
+            ])
+            self._inverse = np.array([
+                [1.0 / z, 0.0, self.x - screen_cx / z],
+                [0.0, 1.0 / z, self.y - screen_cy / z],
+                [0.0, 0.0, 1.0],
+            ])
+            self._matrix_key = key
+        return self._matrix
+
+    def get_inverse_matrix(self):
+        """Return the 3x3 screen->world affine matrix."""
+        self.get_matrix()
+        return self._inverse
+
+    def world_to_screen(self, world_pos):
+        wx, wy = world_pos
+        screen_cx, screen_cy = self._screen_center()
         sx = int((wx - self.x) * self.zoom + screen_cx)
         sy = int((wy - self.y) * self.zoom + screen_cy)
         return sx, sy
 
     def screen_to_world(self, screen_pos):
         sx, sy = screen_pos
-        available_width = ScreenDimensions.SCREEN_WIDTH - self.ui_width
-        screen_cx = available_width // 2
-        screen_cy = ScreenDimensions.SCREEN_HEIGHT // 2
+        screen_cx, screen_cy = self._screen_center()
         wx = (sx - screen_cx) / self.zoom + self.x
         wy = (sy - screen_cy) / self.zoom + self.y
         return wx, wy
 
+    def world_to_screen_many(self, world_points):
+        """Transform an (N, 2) array of world points to integer screen points in one operation.
+
+        Truncates toward zero like world_to_screen so batch and scalar results agree.
+        """
+        pts = np.asarray(world_points, dtype=np.float64).reshape(-1, 2)
+        m = self.get_matrix()
+        out = pts @ m[:2, :2].T + m[:2, 2]
+        return out.astype(np.int64)
+
+    def screen_to_world_many(self, screen_points):
+        """Transform an (N, 2) array of screen points to world points (float) in one operation."""
+        pts = np.asarray(screen_points, dtype=np.float64).reshape(-1, 2)
+        inv = self.get_inverse_matrix()
+        return pts @ inv[:2, :2].T + inv[:2, 2]
+
 
 def grid_to_world(row, col, tile_w=GameConstants.LAND_SIZE, tile_h=GameConstants.LAND_SIZE//2):
     """Convert grid coordinates (row,col) to world (cartesian) coordinates for isometric layout.
@@ -39,3 +103,24 @@ def grid_to_world(row, col, tile_w=GameConstants.LAND_SIZE, tile_h=GameConstants
     wx = (col - row) * (tile_w / 2.0)
     wy = (col + row) * (tile_h / 2.0)
     return wx, wy
+
+
+def grid_to_world_many(rows, cols, tile_w=GameConstants.LAND_SIZE, tile_h=GameConstants.LAND_SIZE//2):
+    """Vectorized grid_to_world: convert arrays of rows and cols to an (N, 2) array of world points."""
+    rows = np.asarray(rows, dtype=np.float64)
+    cols = np.asarray(cols, dtype=np.float64)
+    out = np.empty((rows.size, 2), dtype=np.float64)
+    out[:, 0] = (cols - rows) * (tile_w / 2.0)
+    out[:, 1] = (cols + rows) * (tile_h / 2.0)
+    return out
+
+
+def world_to_grid_many(world_points, tile_w=GameConstants.LAND_SIZE, tile_h=GameConstants.LAND_SIZE//2):
+    """Inverse of grid_to_world_many: map an (N, 2) array of world points to fractional (row, col) pairs."""
+    pts = np.asarray(world_points, dtype=np.float64).reshape(-1, 2)
+    diff = pts[:, 0] / (tile_w / 2.0)  # col - row
+    total = pts[:, 1] / (tile_h / 2.0)  # col + row
+    out = np.empty_like(pts)
+    out[:, 0] = (total - diff) / 2.0
+    out[:, 1] = (total + diff) / 2.0
+    return out
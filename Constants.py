@@ -1,7 +1,9 @@
 class ScreenDimensions:
     """Screen dimension constants."""
-    SCREEN_WIDTH = 1200
+    SCREEN_WIDTH = 1200  # Initial window size; the window is resizable
     SCREEN_HEIGHT = 800
+    MIN_WIDTH = 900
+    MIN_HEIGHT = 600
 
 class Color:
     """Color constants."""
@@ -29,41 +31,89 @@ class GameConstants:
     LAND_SIZE = 100
     BLIGHT_CHANCE = 0.002  # Base chance per second for blight to occur in a coop
     
-    class CoopTypes:
-        """Different coop types with different properties."""
-        CLASSIC = {
-            "name": "Classic Coop",
-            "capacity": 10,  # Max chickens
-            "blight_multiplier": 1.0,  # Blight chance multiplier
-            "land_slots": 1,  # Number of land tiles occupied
-            "cost": 100,
-        }
-        DELUXE = {
-            "name": "Deluxe Coop",
-            "capacity": 20,  # Higher capacity
-            "blight_multiplier": 0.5,  # Lower blight chance (50% of normal)
-            "land_slots": 2,  # Occupies 2 land tiles
-            "cost": 200,
-        }
-    
+    # Coop types and chicken breeds (costs, capacity, production and feed rates) live in breeds.json; see Registry.py
+
     class GameEconomyConstants:
         """Game economy related constants."""
         COOP_COST = 100
-        CHICKEN_COST = 30
         LAND_COST = 150
         EGG_SELL_PRICE = 5
         FEED_COST = 40  # Cost per feed bag
-        # Production rates (eggs per second)
-        CHICKEN_PRODUCTION_RATE = 0.3  # Chickens produce less than coops
         BLIGHT_PENALTY = -0.5  # Production penalty during blight
     
     class FeedConstants:
         """Feed and starvation mechanics."""
         INITIAL_FEED_LEVEL = 100.0  # Starting feed % (0-100)
         FEED_CAPACITY = 100.0  # Max feed level
-        FEED_CONSUMPTION_RATE = 5.0  # Feed % consumed per chicken per minute
         STARVATION_THRESHOLD = 10.0  # Feed % below which chickens start dying
         STARVATION_DEATH_RATE = 0.1  # Chickens killed per second when starving (per chicken)
+        FEED_BAG_SIZE = 50.0  # Feed % added by one bag (FEED_COST)
+        BULK_FEED_TARGET = 100.0  # Feed % that bulk "fill feed" tops selected coops up to
+
+class AutomationConstants:
+    """Automation rule defaults and scheduling limits."""
+    AUTO_FEED_THRESHOLD = 30.0  # Feed % below which the auto-feed rule buys a bag
+    AUTO_SELL_FRACTION = 0.9  # Fraction of egg_capacity above which the auto-sell rule sells
+    AUTO_CURE_MIN_MONEY = 500.0  # Money the auto-cure rule keeps in reserve
+    MAX_EVALUATIONS_PER_TICK = 64  # Rule evaluations allowed per simulation tick
+    MIN_RECHECK_INTERVAL = 0.25  # Game seconds before re-checking a rule whose condition didn't hold
+    RETRY_INTERVAL = 1.0  # Game seconds before retrying a rule whose action couldn't be applied
+
+class MetricsConstants:
+    """Metrics recorder tiers: (sample interval in game seconds, samples kept)."""
+    TIERS = (
+        (1.0, 3600),     # 1 s for an hour
+        (60.0, 1440),    # 1 min for a day
+        (3600.0, 720),   # 1 h for a month
+    )
+    SPARKLINE_POINTS = 120  # Most recent samples shown per sparkline
+
+class FlockConstants:
+    """Chicken wander animation."""
+    WANDER_SPEED = 12.0  # World units per second
+    STEERING = 4.0  # How quickly velocity turns towards the target (per second)
+    ARRIVE_RADIUS = 2.0  # Distance at which a chicken picks a new target
+    YARD_HALF_WIDTH = 0.25  # Yard half-width per land slot, as a fraction of LAND_SIZE
+    YARD_DEPTH = 0.4  # Yard depth as a fraction of the tile height
+    MIN_ZOOM = 0.5  # Below this zoom chickens are too small to animate
+
+class ParticleConstants:
+    """Egg-laying and egg-sale particle effects."""
+    CAPACITY = 2048  # Particles alive at once; emits beyond this are thinned
+    MAX_SPAWN_PER_FRAME = 256  # Global spawn budget shared by all emitters each frame
+    MAX_QUEUED_REQUESTS = 1024  # Emit requests held until update(); older ones are dropped past this
+    FADE_LEVELS = 4  # Pre-rendered alpha steps per sprite
+    EGG_LIFETIME = 0.8  # Seconds
+    EGG_SPEED = 60.0  # World units per second
+    COIN_LIFETIME = 1.2
+    COIN_SPEED = 40.0
+    GRAVITY = 150.0  # World units per second squared, applied to eggs
+    SELL_COINS_PER_COOP = 3
+
+class WeatherConstants:
+    """Weather noise fields, economy modifiers and overlay."""
+    PERIOD = 16  # Weather pattern repeats every PERIOD lands in each direction
+    TIME_FRAMES = 64  # Precomputed time steps per cycle
+    CYCLE_LENGTH = 640.0  # Game seconds before the weather loops
+    SPACE_SMOOTHNESS = 4.0  # Larger values give bigger weather fronts
+    TIME_SMOOTHNESS = 8.0  # Larger values give slower-changing weather
+    UPDATE_INTERVAL = 1.0  # Game seconds between batched coop modifier refreshes
+    RAIN_CLOUD_THRESHOLD = 0.65  # Cloud cover above which it rains
+    HEAT_PRODUCTION_PENALTY = 0.3  # Production lost at maximum heat
+    COLD_PRODUCTION_PENALTY = 0.2  # Production lost at maximum cold
+    RAIN_BLIGHT_BONUS = 1.5  # Extra blight chance multiplier in the heaviest rain
+    # Overlay
+    OVERLAY_SCALE = 8  # Overlay is computed at 1/OVERLAY_SCALE resolution
+    OVERLAY_PAD = 256  # Extra pixels rendered past the view so panning only shifts the cached overlay
+    CLOUD_THRESHOLD = 0.45  # Cloud cover below this draws nothing
+    CLOUD_ALPHA = 90
+    CLOUD_COLOR = (90, 90, 110)
+    RAIN_ALPHA = 160
+    RAIN_COLOR = (170, 190, 230)
+    STREAK_TILE = 48  # Rain streak sheet repeat distance in pixels
+    STREAKS_PER_TILE = 3
+    STREAK_LENGTH = 12  # Pixels
+    RAIN_SCROLL_SPEED = 300.0  # Pixels per second
 
 class LightingConstants:
     """Lighting and visual effect constants."""
@@ -82,3 +132,18 @@ class LightingConstants:
     
     # Vignette effect
     VIGNETTE_STRENGTH = 0.3  # How dark edges get (0-1)
+
+class PacingConstants:
+    """Frame pacing profiles (frames per second / milliseconds)."""
+    ACTIVE_GRACE = 0.5  # Seconds to stay at full rate after the last input
+    # profile name -> (max_fps, idle_fps, background_wait_ms)
+    PROFILES = {
+        "default": (60, 20, 500),
+        "power_saver": (30, 5, 1000),
+    }
+    # Automatic render scale (see RenderScaleController)
+    MIN_RENDER_SCALE = 0.5
+    RENDER_SCALE_STEP = 0.125
+    RENDER_SCALE_SMOOTHING = 0.1  # Weight of the newest frame in the work-time average
+    RENDER_SCALE_HEADROOM = 0.6  # Scale back up once work time drops below this fraction of the target
+    RENDER_SCALE_COOLDOWN = 30  # Frames to hold a new scale before changing again
@@ -0,0 +1,50 @@
+"""Persistent painter's-algorithm ordering for lands and the coops on them."""
+import bisect
+
+
+class DrawOrder:
+    """Keeps land tiles and coops sorted back-to-front so draw() never re-sorts.
+
+    Entries are (land, is_structure) pairs ordered by (depth, layer, insertion). A tile's depth
+    is row + col; a coop's depth is that of its rightmost tile, so a deluxe coop is painted
+    after both tiles it stands on. At equal depth tiles (layer 0) go before coops (layer 1).
+    An insert bisects for its slot but list.insert shifts the tail, so it is O(n); nothing is
+    ever re-sorted. entries() returns an immutable tuple that is rebuilt only after an insert,
+    so simulation snapshots can share it instead of copying the order every tick.
+    """
+    TILE = 0
+    STRUCTURE = 1
+
+    def __init__(self):
+        self._keys = []
+        self._entries = []
+        self._seq = 0
+        self._tuple = ()
+
+    def _insert(self, depth, layer, entry):
+        key = (depth, layer, self._seq)
+        self._seq += 1
+        index = bisect.bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._entries.insert(index, entry)
+        self._tuple = None
+
+    def add_land(self, land):
+        self._insert(land.row + land.col, self.TILE, (land, False))
+
+    def add_coop(self, land):
+        """Register the coop now standing on land (its owner tile)."""
+        last_row, last_col = land.coop.coop_type.footprint[-1]
+        self._insert(land.row + land.col + last_row + last_col, self.STRUCTURE, (land, True))
+
+    def entries(self):
+        """The (land, is_structure) pairs as a tuple, unchanged until the next insert."""
+        if self._tuple is None:
+            self._tuple = tuple(self._entries)
+        return self._tuple
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
@@ -3,29 +3,54 @@ from typing import List
 from Constants import GameConstants, Color
 from Camera import Camera, grid_to_world
 from Lighting import ShadowManager
+from Registry import REGISTRY
 import random
 import pygame
 
 @dataclass
 class Chicken:
-    """Represents a single chicken with an offset relative to its coop's world position."""
+    """Represents a single chicken with an offset relative to its coop's world position.
+
+    Once attached to a FlockSystem the offset is read from the flock's arrays, so it follows
+    the wander animation.
+    """
     def __init__(self, offset_x: float, offset_y: float):
-        self.offset_x: float = offset_x
-        self.offset_y: float = offset_y
+        self._offset_x: float = offset_x
+        self._offset_y: float = offset_y
         self.eggs_produced: float = 0.0
+        self.flock = None
+        self.flock_slot = None
+
+    def attach_flock(self, flock, slot):
+        self.flock = flock
+        self.flock_slot = slot
+
+    @property
+    def offset_x(self) -> float:
+        if self.flock is not None:
+            return float(self.flock.x[self.flock_slot])
+        return self._offset_x
+
+    @property
+    def offset_y(self) -> float:
+        if self.flock is not None:
+            return float(self.flock.y[self.flock_slot])
+        return self._offset_y
 
     def draw(self, screen, world_x, world_y, camera: Camera):
         # compute screen position from coop world pos + offset
         wx = world_x + self.offset_x
         wy = world_y + self.offset_y
         cx, cy = camera.world_to_screen((wx, wy))
+        # Sizes follow zoom so a render-scaled camera draws a proportionally smaller chicken
+        z = camera.zoom
         # body (isometric-style ellipse)
-        body_w = int(GameConstants.CHICKEN_SIZE * 1.6)
-        body_h = int(GameConstants.CHICKEN_SIZE * 1.0)
+        body_w = int(GameConstants.CHICKEN_SIZE * 1.6 * z)
+        body_h = int(GameConstants.CHICKEN_SIZE * 1.0 * z)
         body_rect = pygame.Rect(cx - body_w // 2, cy - body_h // 2, body_w, body_h)
         
         # Draw shadow beneath chicken
-        ShadowManager.draw_shadow(screen, cx, cy, body_w, body_h, offset_y=4)
+        ShadowManager.draw_shadow(screen, cx, cy, body_w, body_h, offset_y=int(4 * z))
         
         pygame.draw.ellipse(screen, Color.ORANGE, body_rect)
         # subtle highlight
@@ -35,13 +60,14 @@ class Chicken:
         # head (slightly offset to give isometric perspective)
         head_x = cx + body_w // 4
         head_y = cy - body_h // 4
-        pygame.draw.ellipse(screen, Color.ORANGE, (head_x - 6, head_y - 6, 12, 12))
+        head_r = int(6 * z)
+        pygame.draw.ellipse(screen, Color.ORANGE, (head_x - head_r, head_y - head_r, head_r * 2, head_r * 2))
 
         # beak (small triangle)
         pygame.draw.polygon(screen, Color.YELLOW, [
-            (head_x + 6, head_y),
-            (head_x + 10, head_y + 3),
-            (head_x + 6, head_y + 4)
+            (head_x + head_r, head_y),
+            (head_x + int(10 * z), head_y + int(3 * z)),
+            (head_x + head_r, head_y + int(4 * z))
         ])
 
 
@@ -50,42 +76,46 @@ class Coop:
     """Represents a chicken coop (logical entity). Drawn by passing world coordinates and camera."""
     def __init__(self, coop_type=None):
         if coop_type is None:
-            coop_type = GameConstants.CoopTypes.CLASSIC
+            coop_type = REGISTRY.default_coop
         self.coop_type = coop_type
         self.chickens: List[Chicken] = []
         self.blight_active = False
         self.eggs_produced: float = 0.0
+        # Fraction of an egg laid but not yet counted; carried between fixed simulation steps
+        self.egg_progress: float = 0.0
         self.feed_level: float = GameConstants.FeedConstants.INITIAL_FEED_LEVEL
+        # Multipliers refreshed in batches by WeatherSystem.update_coops
+        self.weather_production: float = 1.0
+        self.weather_blight: float = 1.0
+        # Bumped on every change the renderer can see, so snapshots re-copy only changed coops
+        self.version: int = 0
 
     def draw(self, screen, world_x, world_y, camera: Camera):
-        # For multi-tile coops, draw the model centered between the two tiles
-        land_slots = self.coop_type.get("land_slots", 1)
-        if land_slots > 1:
-            # Assume horizontal placement (col + 1)
-            # Find the midpoint between the two tiles
-            tile_w = GameConstants.LAND_SIZE
-            # Offset world_x by half a tile to center between two plots
-            world_x = world_x + tile_w / 2
+        # For multi-tile coops, draw the model centered over its footprint
+        coop_type = self.coop_type
+        world_x = world_x + coop_type.anchor_offset_x
         # compute screen pos for center
         coop_world_y = world_y
         cx, cy = camera.world_to_screen((world_x, coop_world_y))
-        # Make the deluxe coop larger
-        size_mult = 1.6 if land_slots > 1 else 1.0
-        half = int(GameConstants.COOP_SIZE * size_mult // 2)
+        # Larger coop types draw bigger; sizes follow zoom like positions do
+        size_mult = coop_type.render_scale * camera.zoom
+        size = coop_type.render_size * camera.zoom
+        half = int(size // 2)
+        d = max(1, int(4 * camera.zoom))  # Depth offset of the side walls
 
         # Draw shadow beneath coop
-        ShadowManager.draw_shadow(screen, cx, cy, int(GameConstants.COOP_SIZE * size_mult * 1.2), int(GameConstants.COOP_SIZE * size_mult // 2), offset_y=8)
+        ShadowManager.draw_shadow(screen, cx, cy, int(size * 1.2), int(size // 2), offset_y=int(8 * camera.zoom))
 
         # Isometric coop building (like a tiny home)
         roof_peak_h = int(20 * size_mult)
-        body_h = half + 4
+        body_h = half + d
 
         # Left side wall (darker for depth)
         left_wall_points = [
             (cx - half, cy - body_h),      # Top left
             (cx - half, cy),               # Bottom left
-            (cx - half + 4, cy + 4),       # Bottom left corner
-            (cx - half + 4, cy - body_h + 4)  # Top left corner (offset)
+            (cx - half + d, cy + d),       # Bottom left corner
+            (cx - half + d, cy - body_h + d)  # Top left corner (offset)
         ]
         left_color = (100, 150, 80) if self.blight_active else (100, 100, 80)
         pygame.draw.polygon(screen, left_color, left_wall_points)
@@ -104,8 +134,8 @@ class Coop:
         right_wall_points = [
             (cx + half, cy - body_h),      # Top right
             (cx + half, cy),               # Bottom right
-            (cx + half + 4, cy + 4),       # Bottom right corner
-            (cx + half + 4, cy - body_h + 4)  # Top right corner (offset)
+            (cx + half + d, cy + d),       # Bottom right corner
+            (cx + half + d, cy - body_h + d)  # Top right corner (offset)
         ]
         right_color = (120, 140, 80) if self.blight_active else (120, 100, 70)
         pygame.draw.polygon(screen, right_color, right_wall_points)
@@ -114,7 +144,7 @@ class Coop:
         left_roof_points = [
             (cx - half, cy - body_h),      # Bottom left
             (cx, cy - body_h - roof_peak_h),  # Peak
-            (cx - half + 4, cy - body_h + 4)  # Bottom left (offset)
+            (cx - half + d, cy - body_h + d)  # Bottom left (offset)
         ]
         left_roof_color = (150, 150, 80) if self.blight_active else (200, 50, 50)
         pygame.draw.polygon(screen, left_roof_color, left_roof_points)
@@ -123,7 +153,7 @@ class Coop:
         right_roof_points = [
             (cx + half, cy - body_h),      # Bottom right
             (cx, cy - body_h - roof_peak_h),  # Peak
-            (cx + half + 4, cy - body_h + 4)  # Bottom right (offset)
+            (cx + half + d, cy - body_h + d)  # Bottom right (offset)
         ]
         right_roof_color = (140, 140, 70) if self.blight_active else (180, 40, 40)
         pygame.draw.polygon(screen, right_roof_color, right_roof_points)
@@ -132,8 +162,8 @@ class Coop:
         roof_side_points = [
             (cx, cy - body_h - roof_peak_h),  # Peak
             (cx + half, cy - body_h),         # Right edge bottom
-            (cx + half + 4, cy - body_h + 4), # Right edge offset
-            (cx + 2, cy - body_h - roof_peak_h + 2)  # Peak offset
+            (cx + half + d, cy - body_h + d), # Right edge offset
+            (cx + d // 2, cy - body_h - roof_peak_h + d // 2)  # Peak offset
         ]
         roof_side_color = (120, 120, 60) if self.blight_active else (140, 30, 30)
         pygame.draw.polygon(screen, roof_side_color, roof_side_points)
@@ -147,19 +177,21 @@ class Coop:
         return self.blight_active
 
     def calculate_blight_chance(self, dt):
+        """Roll for blight onset; returns True if blight started this call."""
         if self.blight_active:
-            return
-        # Base chance scaled by chickens and coop type's blight multiplier
-        base_chance = GameConstants.BLIGHT_CHANCE * len(self.chickens)
-        multiplier = self.coop_type.get("blight_multiplier", 1.0)
-        chance_per_second = base_chance * multiplier
+            return False
+        # Per-chicken hazard already includes the coop type's blight multiplier
+        chance_per_second = self.coop_type.blight_hazard * len(self.chickens) * self.weather_blight
         chance_this_frame = chance_per_second * dt
         if random.random() < chance_this_frame:
             self.blight_active = True
+            self.version += 1
+            return True
+        return False
 
     def get_total_production_rate(self):
         """Calculate total eggs produced per second"""
-        return (GameConstants.GameEconomyConstants.BLIGHT_PENALTY if self.blight_active else 1) * (len(self.chickens) * GameConstants.GameEconomyConstants.CHICKEN_PRODUCTION_RATE)
+        return (GameConstants.GameEconomyConstants.BLIGHT_PENALTY if self.blight_active else 1) * (len(self.chickens) * self.coop_type.breed.production_rate) * self.weather_production
 
     def update_feed(self, dt):
         """Update feed level and handle starvation.
@@ -167,9 +199,12 @@ class Coop:
         Args:
             dt: Delta time in seconds
         """
+        if not self.chickens:
+            return
+        self.version += 1
         # Consume feed based on number of chickens
-        # Feed consumption: FeedConstants.FEED_CONSUMPTION_RATE % per chicken per minute
-        consumption_per_second = (len(self.chickens) * GameConstants.FeedConstants.FEED_CONSUMPTION_RATE) / 60.0
+        # Feed consumption: the breed's feed_rate % per chicken per minute
+        consumption_per_second = len(self.chickens) * self.coop_type.breed.feed_per_second
         self.feed_level -= consumption_per_second * dt
         self.feed_level = max(0, self.feed_level)  # Can't go below 0
         
@@ -193,6 +228,7 @@ class Coop:
             GameConstants.FeedConstants.FEED_CAPACITY,
             self.feed_level + amount
         )
+        self.version += 1
 
 
 @dataclass
@@ -208,11 +244,15 @@ class Land:
         self.coop_occupying_land = None  # If this land is occupied by a larger coop from another slot
 
     def draw(self, screen, camera: Camera):
+        self.draw_tile(screen, camera)
+        self.draw_structure(screen, camera)
+
+    def draw_tile(self, screen, camera: Camera):
         # Always draw land tile, even if occupied by a multi-slot coop from an adjacent land
         world_x, world_y = grid_to_world(self.row, self.col)
         sx, sy = camera.world_to_screen((world_x, world_y))
-        tile_w = GameConstants.LAND_SIZE
-        tile_h = GameConstants.LAND_SIZE // 2
+        tile_w = int(GameConstants.LAND_SIZE * camera.zoom)
+        tile_h = int(GameConstants.LAND_SIZE // 2 * camera.zoom)
         half_w = tile_w // 2
         half_h = tile_h // 2
 
@@ -228,11 +268,13 @@ class Land:
 
         # Draw border (highlight if selected)
         border_color = Color.YELLOW if self.is_selected else Color.GREEN
-        border_width = 4 if self.is_selected else 2
+        border_width = max(1, int((4 if self.is_selected else 2) * camera.zoom))
         pygame.draw.polygon(screen, border_color, points, border_width)
 
+    def draw_structure(self, screen, camera: Camera):
         # Draw structure if present (pass world coords so Coop can draw chickens via camera)
         if self.coop:
+            world_x, world_y = grid_to_world(self.row, self.col)
             self.coop.draw(screen, world_x, world_y, camera)
 
     def contains_point(self, world_point):
@@ -0,0 +1,369 @@
+"""Differential equivalence harness: check an alternative economy engine against Game.
+
+Both engines start from the same seeded scenario (farm layout, money, eggs, per-coop
+chickens/feed/blight), replay the same action script and are compared after every tick.
+The first divergence is reported together with a minimized scenario that still diverges,
+written as JSON so it can be replayed.
+
+The economy's only draws from the random module are blight rolls: one random.random() per
+coop without blight, per step, in land order. Each engine's run starts from
+random.seed(scenario.seed), so an alternative engine must draw in the same order.
+
+Weather is part of the economy unless scenario.weather is false. The reference builds
+Weather.WeatherSystem(seed=scenario.seed). Each step first adds dt to game_time; then, on
+the first step and on every step at least WeatherConstants.UPDATE_INTERVAL game seconds
+after the previous refresh, it samples the weather at every coop's owner (row, col) and
+sets coop.weather_production (multiplies the egg rate) and coop.weather_blight (multiplies
+the blight chance) from WeatherSystem.modifiers. An engine can simply call
+WeatherSystem.update_coops. With scenario.weather false (--no-weather) both modifiers
+stay 1.0, which compares engines on the core economy alone.
+
+Eggs are laid whole: each coop accumulates production_rate * dt in egg_progress and only
+the integer part is added to its eggs, so engines must carry that remainder between steps.
+egg_progress is clamped at 0 after adding, so a blighted coop's negative rate drains the
+remainder but never removes eggs.
+
+An engine is any class constructed with a Scenario that provides:
+  apply(action)   action is a Server-style command dict, e.g. {"cmd": "buy_feed", "row": 0, "col": 1}
+  step(dt)        advance the economy by dt seconds
+  observe()       return an Observation
+
+Usage (headless):
+  python Equivalence.py --scenarios 2000 --engine mymodule:FastEngine
+  python Equivalence.py --replay divergence.json --engine mymodule:FastEngine
+Without --engine the reference is checked against itself, which catches nondeterminism.
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+from dataclasses import dataclass, field, asdict, replace
+from typing import List, NamedTuple, Tuple
+from Constants import GameConstants
+from Registry import REGISTRY
+
+
+# Largest absolute difference accepted per compared quantity
+TOLERANCES = {"money": 1e-6, "total_eggs": 1e-6, "egg_capacity": 1e-9, "expanded_capacity_price": 1e-9, "feed": 1e-6,
+              "egg_progress": 1e-6}
+
+GRID_COLS = 4  # Game.buy_land fills rows of four
+
+
+@dataclass
+class Scenario:
+    """A seeded starting state plus an action script. Serializes to plain JSON."""
+    seed: int
+    dt: float
+    ticks: int
+    money: float
+    total_eggs: float
+    egg_capacity: float
+    land_count: int
+    expanded_capacity_price: float = 650
+    weather: bool = True  # False keeps every coop's weather modifiers at 1.0
+    # Each coop: {"row", "col", "type", "chickens", "feed", "blight"}
+    coops: List[dict] = field(default_factory=list)
+    # Each action: [tick, command dict]; applied before that tick's step
+    actions: List[list] = field(default_factory=list)
+
+    def to_json(self):
+        return json.dumps(asdict(self), indent=2)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(**json.loads(text))
+
+
+class Observation(NamedTuple):
+    money: float
+    total_eggs: float
+    egg_capacity: float
+    expanded_capacity_price: float
+    # (row, col, feed_level, chicken_count, blight_active, egg_progress) for every land holding a coop, in land order
+    coops: Tuple[tuple, ...]
+
+
+@dataclass
+class Divergence:
+    tick: int
+    field: str
+    reference: object
+    candidate: object
+
+    def __str__(self):
+        return f"tick {self.tick}: {self.field} reference={self.reference!r} candidate={self.candidate!r}"
+
+
+def compare(tick, reference, candidate):
+    """Return the first Divergence between two observations, or None if they agree within TOLERANCES."""
+    for name in ("money", "total_eggs", "egg_capacity", "expanded_capacity_price"):
+        a, b = getattr(reference, name), getattr(candidate, name)
+        if not abs(a - b) <= TOLERANCES[name]:
+            return Divergence(tick, name, a, b)
+    if len(reference.coops) != len(candidate.coops):
+        return Divergence(tick, "coop count", len(reference.coops), len(candidate.coops))
+    for ref, cand in zip(reference.coops, candidate.coops):
+        where = f"coop at {ref[0]},{ref[1]}"
+        if ref[:2] != cand[:2]:
+            return Divergence(tick, "coop position", ref[:2], cand[:2])
+        if not abs(ref[2] - cand[2]) <= TOLERANCES["feed"]:
+            return Divergence(tick, f"{where} feed", ref[2], cand[2])
+        if ref[3] != cand[3]:
+            return Divergence(tick, f"{where} chickens", ref[3], cand[3])
+        if ref[4] != cand[4]:
+            return Divergence(tick, f"{where} blight", ref[4], cand[4])
+        if not abs(ref[5] - cand[5]) <= TOLERANCES["egg_progress"]:
+            return Divergence(tick, f"{where} egg progress", ref[5], cand[5])
+    return None
+
+
+class ReferenceEngine:
+    """Runs a scenario through the real Game.step_simulation and Coop code.
+
+    Building a Game costs tens of milliseconds (display, fonts, panels), so one instance is
+    shared and its economy state reset per scenario.
+    """
+    _game = None
+
+    def __init__(self, scenario):
+        from Game import Game
+        from Entities import Coop
+        from Automation import RuleEngine
+        from Metrics import MetricsRecorder
+        from Flock import FlockSystem
+        from Particles import ParticleSystem
+        from Weather import WeatherSystem
+        from DrawOrder import DrawOrder
+
+        if ReferenceEngine._game is None:
+            ReferenceEngine._game = Game()
+        game = self.game = ReferenceEngine._game
+        game.lands = []
+        game.land_grid = {}
+        game.draw_order = DrawOrder()
+        game.selected_land = None
+        game.selected_lands = []
+        game.money = scenario.money
+        game.total_eggs = scenario.total_eggs
+        game.egg_capacity = scenario.egg_capacity
+        game.expanded_capacity_price = scenario.expanded_capacity_price
+        game.game_time = 0.0
+        game.rules = RuleEngine()
+        game.metrics = MetricsRecorder()
+        game.flock = FlockSystem()
+        game.particles = ParticleSystem()
+        game.weather = WeatherSystem(seed=scenario.seed) if scenario.weather else None
+
+        for i in range(scenario.land_count):
+            game.add_land(i // GRID_COLS, i % GRID_COLS)
+        for spec in scenario.coops:
+            land = game.land_grid[(spec["row"], spec["col"])]
+            coop = Coop(coop_type=REGISTRY.coops[spec["type"]])
+            land.coop = coop
+            game.flock.register_coop(coop, game._coop_anchor(land, coop))
+            for dr, dc in coop.coop_type.footprint[1:]:
+                game.land_grid[(spec["row"] + dr, spec["col"] + dc)].coop_occupying_land = coop
+            game.draw_order.add_coop(land)
+            coop.chickens = [game._new_chicken(coop) for _ in range(spec["chickens"])]
+            coop.feed_level = spec["feed"]
+            coop.blight_active = spec["blight"]
+
+    def apply(self, action):
+        from Server import COMMANDS
+        try:
+            COMMANDS[action["cmd"]](self.game, action)
+        except ValueError:
+            pass  # No land at row/col; the player clicked nothing
+
+    def step(self, dt):
+        self.game.step_simulation(dt)
+
+    def observe(self):
+        game = self.game
+        return Observation(
+            game.money,
+            game.total_eggs,
+            game.egg_capacity,
+            game.expanded_capacity_price,
+            tuple((land.row, land.col, land.coop.feed_level, len(land.coop.chickens), land.coop.blight_active,
+                   land.coop.egg_progress)
+                  for land in game.lands if land.coop),
+        )
+
+
+def _run(engine_class, scenario):
+    """Yield (tick, observation) for a scenario; tick -1 is the state before the first step."""
+    engine = engine_class(scenario)
+    random.seed(scenario.seed)
+    actions = {}
+    for tick, action in scenario.actions:
+        actions.setdefault(tick, []).append(action)
+    yield -1, engine.observe()
+    for tick in range(scenario.ticks):
+        for action in actions.get(tick, ()):
+            engine.apply(action)
+        engine.step(scenario.dt)
+        yield tick, engine.observe()
+
+
+def first_divergence(scenario, candidate, reference=ReferenceEngine):
+    """Run both engines over the scenario; return the first Divergence or None.
+
+    The reference trace is recorded first so the two runs don't share the random stream.
+    """
+    trace = list(_run(reference, scenario))
+    for (tick, expected), (_, actual) in zip(trace, _run(candidate, scenario)):
+        divergence = compare(tick, expected, actual)
+        if divergence is not None:
+            return divergence
+    return None
+
+
+def minimize(scenario, candidate, reference=ReferenceEngine):
+    """Greedily shrink a diverging scenario while it keeps diverging.
+
+    Cuts the run at the divergence, then tries dropping each action, dropping each coop and
+    halving chicken counts. Returns (scenario, divergence) for the smallest one found.
+    """
+    divergence = first_divergence(scenario, candidate, reference)
+    if divergence is None:
+        return scenario, None
+
+    def attempt(smaller):
+        nonlocal scenario, divergence
+        found = first_divergence(smaller, candidate, reference)
+        if found is None:
+            return False
+        scenario, divergence = smaller, found
+        return True
+
+    changed = True
+    while changed:
+        changed = False
+        ticks = divergence.tick + 1
+        if ticks < scenario.ticks:
+            changed |= attempt(replace(scenario, ticks=ticks, actions=[a for a in scenario.actions if a[0] < ticks]))
+        for i in reversed(range(len(scenario.actions))):
+            if i < len(scenario.actions):
+                changed |= attempt(replace(scenario, actions=scenario.actions[:i] + scenario.actions[i + 1:]))
+        for i in reversed(range(len(scenario.coops))):
+            if i < len(scenario.coops):
+                changed |= attempt(replace(scenario, coops=scenario.coops[:i] + scenario.coops[i + 1:]))
+        for i, spec in enumerate(scenario.coops):
+            if spec["chickens"] > 1:
+                fewer = dict(spec, chickens=spec["chickens"] // 2)
+                changed |= attempt(replace(scenario, coops=scenario.coops[:i] + [fewer] + scenario.coops[i + 1:]))
+    return scenario, divergence
+
+
+def random_scenario(seed):
+    """Build a scenario that exercises the economy's edge cases: starvation, blight,
+    egg_capacity clamping, large time steps and purchases the player can't afford."""
+    rng = random.Random(seed)
+    land_count = rng.randint(1, 16)
+    free = {(i // GRID_COLS, i % GRID_COLS) for i in range(land_count)}
+    coops = []
+    for row, col in sorted(free):
+        if (row, col) not in free or rng.random() < 0.3:
+            continue
+        # Any registered type whose footprint fits on the free tiles from here
+        fits = [coop_type for coop_type in REGISTRY.coops.values()
+                if all((row + dr, col + dc) in free for dr, dc in coop_type.footprint)]
+        if not fits:
+            continue
+        coop_type = rng.choice(fits)
+        free.difference_update((row + dr, col + dc) for dr, dc in coop_type.footprint)
+        capacity = coop_type.capacity
+        threshold = GameConstants.FeedConstants.STARVATION_THRESHOLD
+        coops.append({
+            "row": row,
+            "col": col,
+            "type": coop_type.key,
+            "chickens": rng.randint(0, capacity),
+            # Half the coops start near the starvation threshold
+            "feed": rng.uniform(0.0, threshold * 2) if rng.random() < 0.5 else rng.uniform(0.0, 100.0),
+            "blight": rng.random() < 0.2,
+        })
+
+    ticks = rng.randint(20, 300)
+    commands = ["buy_land", "buy_coop", "buy_chicken", "buy_feed", "sell_eggs",
+                "buy_blight_cure", "cull_blighted_chickens", "upgrade_egg_capacity"]
+    actions = []
+    for _ in range(rng.randint(0, 20)):
+        action = {"cmd": rng.choice(commands), "row": rng.randint(0, 4), "col": rng.randint(0, 3)}
+        if action["cmd"] == "buy_coop":
+            action["type"] = rng.choice(sorted(REGISTRY.coops))
+        actions.append([rng.randrange(ticks), action])
+    actions.sort(key=lambda a: a[0])
+
+    egg_capacity = rng.choice([0.0, 10.0, 200.0, 1000.0])
+    return Scenario(
+        seed=seed,
+        dt=rng.choice([1 / 60, 1 / 30, 0.1, 0.5, 1.0, 5.0]),
+        ticks=ticks,
+        money=rng.choice([0.0, 50.0, 500.0, 5000.0, 1e6]),
+        total_eggs=rng.uniform(0.0, egg_capacity),
+        egg_capacity=egg_capacity,
+        land_count=land_count,
+        expanded_capacity_price=rng.choice([650, 1000]),
+        coops=coops,
+        actions=actions,
+    )
+
+
+def load_engine(spec):
+    """Import "module:Class"."""
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def run_suite(candidate, scenarios, first_seed=0, report_path="divergence.json", weather=True):
+    """Check candidate over randomized scenarios. Returns the number of diverging scenarios."""
+    failures = 0
+    for seed in range(first_seed, first_seed + scenarios):
+        scenario = replace(random_scenario(seed), weather=weather)
+        divergence = first_divergence(scenario, candidate)
+        if divergence is None:
+            continue
+        failures += 1
+        if failures == 1:
+            smallest, smallest_divergence = minimize(scenario, candidate)
+            print(f"seed {seed} diverges at {divergence}")
+            print(f"minimized: {smallest_divergence}")
+            with open(report_path, "w") as f:
+                f.write(smallest.to_json())
+            print(f"reproduction written to {report_path}")
+    print(f"{scenarios - failures}/{scenarios} scenarios equivalent")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare an economy engine against the reference Game")
+    parser.add_argument("--engine", default=None, help="candidate engine as module:Class (default: the reference itself)")
+    parser.add_argument("--scenarios", type=int, default=1000, help="number of randomized scenarios")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first scenario")
+    parser.add_argument("--replay", metavar="PATH", default=None, help="run one scenario from a JSON reproduction")
+    parser.add_argument("--report", metavar="PATH", default="divergence.json", help="where to write the minimized reproduction")
+    parser.add_argument("--no-weather", action="store_true",
+                        help="keep weather modifiers neutral so only the core economy is compared")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.init()
+    candidate = load_engine(args.engine) if args.engine else ReferenceEngine
+    if args.replay:
+        with open(args.replay) as f:
+            divergence = first_divergence(Scenario.from_json(f.read()), candidate)
+        print(divergence or "equivalent")
+        failed = divergence is not None
+    else:
+        failed = run_suite(candidate, args.scenarios, args.seed, args.report, weather=not args.no_weather) > 0
+    pygame.quit()
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
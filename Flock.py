@@ -0,0 +1,158 @@
+"""Vectorized wander animation for every chicken on the farm."""
+import threading
+import weakref
+import numpy as np
+from Constants import GameConstants, FlockConstants
+
+
+class FlockSystem:
+    """Stores chicken positions, velocities and wander targets in NumPy arrays and moves them
+    all in one vectorized step per frame.
+
+    Positions are offsets from the coop's anchor (the point Coop.draw passes to Chicken.draw),
+    clamped to a yard whose width scales with the coop's land_slots. Chickens whose coop is
+    off screen, or drawn below FlockConstants.MIN_ZOOM, are masked out of the step and keep
+    their position. A slot is freed automatically when its Chicken is garbage collected.
+
+    Arrays are kept one per component (x, y, vx, ...) rather than (N, 2) so every operation
+    runs over contiguous memory.
+    """
+    _PER_SLOT = ("x", "y", "vx", "vy", "tx", "ty", "x_min", "x_max", "y_min", "y_max")
+
+    def __init__(self, capacity=256, seed=None):
+        self.rng = np.random.default_rng(seed)
+        # add() may run on the simulation thread; reentrant because slot release runs from GC
+        self.lock = threading.RLock()
+        self._allocate(capacity)
+        self._free = list(range(capacity - 1, -1, -1))
+        self.high_water = 0  # One past the highest slot ever used; steps only touch [:high_water]
+        # Per-coop anchors in world space, indexed by coop_index
+        self.coop_anchors = np.zeros((16, 2))
+        self._coop_ids = {}  # id(coop) -> coop index
+
+    def _allocate(self, capacity, old_size=0):
+        for name in self._PER_SLOT + ("_dx", "_dy", "_dist", "_tmp"):
+            grown = np.zeros(capacity)
+            if old_size:
+                grown[:old_size] = getattr(self, name)[:old_size]
+            setattr(self, name, grown)
+        coop_index = np.zeros(capacity, dtype=np.int64)
+        alive = np.zeros(capacity, dtype=bool)
+        if old_size:
+            coop_index[:old_size] = self.coop_index
+            alive[:old_size] = self.alive
+        self.coop_index = coop_index
+        self.alive = alive
+
+    @staticmethod
+    def yard_bounds(land_slots):
+        tile_w = GameConstants.LAND_SIZE
+        tile_h = GameConstants.LAND_SIZE // 2
+        half_w = tile_w * FlockConstants.YARD_HALF_WIDTH * land_slots
+        return (-half_w, half_w, 0.0, tile_h * FlockConstants.YARD_DEPTH)
+
+    def register_coop(self, coop, anchor):
+        """Record the world point the coop's chickens are drawn relative to."""
+        with self.lock:
+            if id(coop) in self._coop_ids:
+                return
+            index = len(self._coop_ids)
+            if index >= len(self.coop_anchors):
+                self.coop_anchors = np.concatenate((self.coop_anchors, np.zeros_like(self.coop_anchors)))
+            self.coop_anchors[index] = anchor
+            self._coop_ids[id(coop)] = index
+
+    def anchor_of(self, coop):
+        """World anchor recorded for a registered coop."""
+        return self.coop_anchors[self._coop_ids[id(coop)]]
+
+    def anchors(self):
+        """(N, 2) view of every registered coop's anchor."""
+        return self.coop_anchors[:len(self._coop_ids)]
+
+    def add(self, chicken, coop):
+        """Start animating a chicken that lives in a registered coop."""
+        with self.lock:
+            if not self._free:
+                old = len(self.alive)
+                self._allocate(old * 2, old)
+                self._free.extend(range(old * 2 - 1, old - 1, -1))
+            slot = self._free.pop()
+            self.high_water = max(self.high_water, slot + 1)
+            self.x[slot] = self.tx[slot] = chicken.offset_x
+            self.y[slot] = self.ty[slot] = chicken.offset_y
+            self.vx[slot] = self.vy[slot] = 0.0
+            (self.x_min[slot], self.x_max[slot],
+             self.y_min[slot], self.y_max[slot]) = self.yard_bounds(coop.coop_type.land_slots)
+            self.coop_index[slot] = self._coop_ids[id(coop)]
+            self.alive[slot] = True
+        chicken.attach_flock(self, slot)
+        weakref.finalize(chicken, self._release, slot).atexit = False
+
+    def _release(self, slot):
+        with self.lock:
+            self.alive[slot] = False
+            self._free.append(slot)
+
+    def visible_coops(self, camera):
+        """Boolean array over coop indices: True where the coop's yard is on screen and zoom is high enough."""
+        count = len(self._coop_ids)
+        if camera.zoom < FlockConstants.MIN_ZOOM:
+            return np.zeros(count, dtype=bool)
+        screen = camera.world_to_screen_many(self.coop_anchors[:count])
+        margin = GameConstants.LAND_SIZE * camera.zoom
+        return ((screen[:, 0] > -margin) & (screen[:, 0] < camera.width + margin)
+                & (screen[:, 1] > -margin) & (screen[:, 1] < camera.height + margin))
+
+    def step(self, dt, camera):
+        """Advance every visible chicken by dt seconds. Returns the number of chickens moved."""
+        with self.lock:
+            n = self.high_water
+            if n == 0:
+                return 0
+            moving = self.alive[:n] & self.visible_coops(camera)[self.coop_index[:n]]
+            count = np.count_nonzero(moving)
+            if count == 0:
+                return 0
+
+            x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+            tx, ty = self.tx[:n], self.ty[:n]
+            dx, dy, dist, tmp = self._dx[:n], self._dy[:n], self._dist[:n], self._tmp[:n]
+
+            # Squared distance to target
+            np.subtract(tx, x, out=dx)
+            np.subtract(ty, y, out=dy)
+            np.multiply(dx, dx, out=dist)
+            np.multiply(dy, dy, out=tmp)
+            np.add(dist, tmp, out=dist)
+
+            # Chickens that reached their target pick a new one somewhere in their yard
+            arrived = np.flatnonzero((dist < FlockConstants.ARRIVE_RADIUS ** 2) & moving)
+            if arrived.size:
+                picks = self.rng.random((2, arrived.size))
+                x_min, y_min = self.x_min[arrived], self.y_min[arrived]
+                new_tx = x_min + picks[0] * (self.x_max[arrived] - x_min)
+                new_ty = y_min + picks[1] * (self.y_max[arrived] - y_min)
+                tx[arrived] = new_tx
+                ty[arrived] = new_ty
+                dx[arrived] = new_tx - x[arrived]
+                dy[arrived] = new_ty - y[arrived]
+                dist[arrived] = dx[arrived] ** 2 + dy[arrived] ** 2
+
+            # dist becomes speed / distance, scaling (dx, dy) to the desired velocity
+            np.sqrt(dist, out=dist)
+            np.maximum(dist, 1e-6, out=dist)
+            np.divide(FlockConstants.WANDER_SPEED, dist, out=dist)
+            # Frozen chickens get zero steering and zero time step
+            gain = moving * min(1.0, FlockConstants.STEERING * dt)
+            step_dt = moving * dt
+            for delta, vel, pos in ((dx, vx, x), (dy, vy, y)):
+                np.multiply(delta, dist, out=delta)
+                np.subtract(delta, vel, out=delta)
+                np.multiply(delta, gain, out=delta)
+                np.add(vel, delta, out=vel)
+                np.multiply(vel, step_dt, out=tmp)
+                np.add(pos, tmp, out=pos)
+            np.clip(x, self.x_min[:n], self.x_max[:n], out=x)
+            np.clip(y, self.y_min[:n], self.y_max[:n], out=y)
+            return count
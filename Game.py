@@ -1,25 +1,42 @@
-from Constants import ScreenDimensions, GameConstants, Color
-from Ui import Button, CollapsiblePanel, SelectablePanel
+from Constants import ScreenDimensions, GameConstants, Color, MetricsConstants, ParticleConstants
+from Ui import Button, CollapsiblePanel, SelectablePanel, SparklinePanel, UiTree
 from Entities import Land, Coop, Chicken
-from Camera import Camera, grid_to_world
+from Camera import Camera, grid_to_world, grid_to_world_many, world_to_grid_many
 from Lighting import LightingSystem, VignetteEffect
+from Simulation import SimulationThread
+from Pacing import FramePacer, RenderScaleController
+from Profiling import STARTUP_TRACE, MEMORY_MONITOR
+from Automation import RuleEngine
+from Metrics import MetricsRecorder
+from Flock import FlockSystem
+from Particles import ParticleSystem
+from Weather import WeatherSystem
+from DrawOrder import DrawOrder
+from Registry import REGISTRY
 import pygame
 from enum import Enum
 from typing import List
+import math
 import random
+import threading
+import time
 
 class Game:
     class GameState(Enum):
         PLAYING = 1
         PAUSED = 2
 
-    def __init__(self):
-        self.screen = pygame.display.set_mode((ScreenDimensions.SCREEN_WIDTH, ScreenDimensions.SCREEN_HEIGHT))
-        pygame.display.set_caption("Eggonomics")
+    def __init__(self, threaded_simulation=False, tick_rate=60, pacing_profile="default", fps_cap=None,
+                 render_scale=1.0, target_frame_ms=None):
+        with STARTUP_TRACE.stage("display"):
+            self.screen = pygame.display.set_mode((ScreenDimensions.SCREEN_WIDTH, ScreenDimensions.SCREEN_HEIGHT), pygame.RESIZABLE)
+            pygame.display.set_caption("Eggonomics")
         self.clock = pygame.time.Clock()
-        self.font_large = pygame.font.Font(None, 36)
-        self.font_medium = pygame.font.Font(None, 24)
-        self.font_small = pygame.font.Font(None, 18)
+        self.pacer = FramePacer(self.clock, pacing_profile, fps_cap)
+        with STARTUP_TRACE.stage("fonts"):
+            self.font_large = pygame.font.Font(None, 36)
+            self.font_medium = pygame.font.Font(None, 24)
+            self.font_small = pygame.font.Font(None, 18)
 
         self.state = None
         self.state = self.GameState.PLAYING
@@ -31,39 +48,115 @@ class Game:
         self.expanded_capacity_price = 650
         self.money = 500.0
         self.lands: List[Land] = []
+        # (row, col) -> Land, for grid lookups without scanning self.lands
+        self.land_grid = {}
+        # Back-to-front tiles and coops, maintained on purchase instead of sorted each frame
+        self.draw_order = DrawOrder()
         self.game_time = 0.0
         self.selected_land = None
+        # Multi-selection from a drag rectangle; mutually exclusive with selected_land
+        self.selected_lands: List[Land] = []
+        self.drag_start = None
+        self.drag_rect = None
         # camera pan speed (world units/sec)
         self.pan_speed = Camera.PAN_SPEED
 
-        # Initialize lighting system
-        self.lighting_system = LightingSystem()
-        self.vignette_effect = VignetteEffect(ScreenDimensions.SCREEN_WIDTH, ScreenDimensions.SCREEN_HEIGHT)
-
-        # Initialize coop info panel
-        self.coop_info_panel = CollapsiblePanel(10, 10, 250, 200, title="Coop Info")
-
-        # Initialize coop selector panel (below coop info panel to avoid overlap)
-        self.coop_selector_panel = SelectablePanel(
-            10,
-            220,
-            250,
-            150,
-            title="Select Coop",
-            options={
-                "classic": GameConstants.CoopTypes.CLASSIC,
-                "deluxe": GameConstants.CoopTypes.DELUXE,
-            }
-        )
+        # Initialize lighting system (the vignette bakes on a background thread)
+        with STARTUP_TRACE.stage("lighting"):
+            self.lighting_system = LightingSystem()
+            self.vignette_effect = VignetteEffect(ScreenDimensions.SCREEN_WIDTH, ScreenDimensions.SCREEN_HEIGHT)
+
+        with STARTUP_TRACE.stage("panels"):
+            # Initialize coop info panel
+            self.coop_info_panel = CollapsiblePanel(10, 10, 250, 200, title="Coop Info")
+
+            # Initialize coop selector panel (below coop info panel to avoid overlap)
+            self.coop_selector_panel = SelectablePanel(
+                10,
+                220,
+                250,
+                150,
+                title="Select Coop",
+                options={key: {"name": coop_type.name, "cost": coop_type.cost}
+                         for key, coop_type in REGISTRY.coops.items()},
+                on_select=self.select_coop_type,
+            )
+
+            # Automation rule stats (only drawn when rules are installed)
+            self.automation_panel = CollapsiblePanel(10, 400, 250, 120, title="Automation")
+
+            # Sparklines of the recorded farm metrics
+            self.metrics_panel = SparklinePanel(270, 10, 260, 35 + len(MetricsRecorder.METRICS) * SparklinePanel.ROW_HEIGHT, title="Farm Metrics")
 
         # initialize map
-        self.setup_initial_plot()
+        with STARTUP_TRACE.stage("map"):
+            self.setup_initial_plot()
 
         # create camera (centered on map centroid)
         # camera is set in setup_initial_plot
 
         # Create UI buttons
-        self.setup_buttons()
+        with STARTUP_TRACE.stage("buttons"):
+            self.setup_buttons()
+            self.layout_ui()
+
+        # The world layer (map, effects, weather) renders at render_scale and is upscaled;
+        # the UI always renders at native resolution. target_frame_ms enables automatic scaling.
+        self.render_scale = render_scale
+        self.render_scale_controller = RenderScaleController(target_frame_ms, render_scale) if target_frame_ms else None
+        self._world_layer = None
+
+        # Automation rules; empty unless the player installs some
+        self.rules = RuleEngine()
+        self.metrics = MetricsRecorder()
+        self.flock = FlockSystem()
+        # Cosmetic rolls get their own stream so the economy's random sequence is only blight rolls
+        self._cosmetic_random = random.Random()
+        self.particles = ParticleSystem()
+        # Precomputing the weather fields takes ~20 ms, so build them off the main thread;
+        # until they are ready the sky is clear and coops keep their neutral modifiers
+        self._weather = None
+        self._weather_thread = threading.Thread(target=self._build_weather, name="weather", daemon=True)
+        self._weather_thread.start()
+
+        # Optional worker thread that owns the economy; None means run() steps it inline
+        self.tick_rate = tick_rate
+        self.simulation = SimulationThread(self, tick_rate) if threaded_simulation else None
+        self._sim_accumulator = 0.0
+
+    def _build_weather(self):
+        with STARTUP_TRACE.stage("weather (background)"):
+            self._weather = WeatherSystem()
+
+    @property
+    def weather(self):
+        """The WeatherSystem, waiting for the background build if it has not finished yet."""
+        if self._weather is None:
+            self._weather_thread.join()
+        return self._weather
+
+    @weather.setter
+    def weather(self, weather):
+        # Let the background build finish first so it cannot overwrite this one
+        self._weather_thread.join()
+        self._weather = weather
+
+    def dispatch(self, command, *args):
+        """Run a state-changing command now, or queue it for the simulation thread.
+
+        Returns:
+            The command's result, or in threaded mode a Future that resolves to it
+        """
+        if self.simulation is not None:
+            return self.simulation.submit(self._run_command, command, *args)
+        return self._run_command(command, *args)
+
+    def _run_command(self, command, *args):
+        try:
+            return command(*args)
+        finally:
+            # Player actions can move any rule's threshold crossing earlier
+            self.rules.invalidate()
 
     def setup_initial_plot(self):
         cols = 4
@@ -71,7 +164,7 @@ class Game:
         # create logical lands (store row/col)
         for row in range(rows):
             for col in range(cols):
-                self.lands.append(Land(0, 0, row=row, col=col))
+                self.add_land(row, col)
         # center camera on centroid
         wxs = []
         wys = []
@@ -81,103 +174,250 @@ class Game:
             wys.append(wy)
         self.camera = Camera(x=sum(wxs) / len(wxs), y=sum(wys) / len(wys), zoom=1.0)
 
+    # Sidebar button key -> offset from the top of the button column. Positions are applied by layout_ui.
+    SIDEBAR_OFFSETS = {
+        'buy_land': 0,
+        'buy_chicken': 50,
+        'upgrade_egg_capacity': 100,
+        'buy_feed': 150,
+        'sell_eggs': 200,
+        'buy_blight_cure': 260,
+        'cull_blighted_chickens': 300,
+        'bulk_fill_feed': 350,
+        'bulk_fill_chickens': 395,
+    }
+    SIDEBAR_WIDTH = 180
+    # Status line -> offset from the top of the status block, which ends STATUS_HEIGHT below
+    # its top on tall windows and is squeezed into the space under the button column otherwise
+    STATUS_OFFSETS = {
+        'blight': 0,
+        'money': 50,
+        'eggs': 90,
+        'time': 130,
+        'selected': 170,
+    }
+    STATUS_HEIGHT = 200
+    STATUS_MIN_SCALE = 0.45  # Keeps squeezed lines from overlapping
+    INSTRUCTIONS_HEIGHT = 100
+
     def setup_buttons(self):
-        button_y = 20
         button_height = 40
         button_width = 140
-        button_x = ScreenDimensions.SCREEN_WIDTH - button_width - 20
+        # Every clickable widget, hit-tested spatially; later additions are on top, matching draw order
+        self.ui = UiTree()
+        for panel in (self.coop_info_panel, self.automation_panel, self.metrics_panel, self.coop_selector_panel):
+            panel.attach(self.ui)
         self.buttons = {
-            'buy_land': Button(button_x, button_y, button_width, button_height, f"Buy Land ${GameConstants.GameEconomyConstants.LAND_COST}", Color.LIGHT_GREEN, Color.BLACK),
-            'buy_chicken': Button(button_x, button_y + 100, button_width, button_height, f"Buy Chicken ${GameConstants.GameEconomyConstants.CHICKEN_COST}", Color.YELLOW, Color.BLACK),
-            'upgrade_egg_capacity': Button(button_x, button_y + 150, button_width, button_height, f"Upgrade Capacity ${self.expanded_capacity_price}", Color.BLUE, Color.WHITE),
-            'buy_feed': Button(button_x, button_y + 200, button_width, button_height, f"Buy Feed ${GameConstants.GameEconomyConstants.FEED_COST}", Color.ORANGE, Color.BLACK),
-            'sell_eggs': Button(button_x, button_y + 250, button_width, button_height, "Sell All Eggs", Color.GREEN, Color.WHITE),
+            'buy_land': Button(0, 0, button_width, button_height, f"Buy Land ${GameConstants.GameEconomyConstants.LAND_COST}", Color.LIGHT_GREEN, Color.BLACK),
+            'buy_chicken': Button(0, 0, button_width, button_height, f"Buy Chicken ${REGISTRY.default_coop.breed.cost}", Color.YELLOW, Color.BLACK),
+            'upgrade_egg_capacity': Button(0, 0, button_width, button_height, f"Upgrade Capacity ${self.expanded_capacity_price}", Color.BLUE, Color.WHITE),
+            'buy_feed': Button(0, 0, button_width, button_height, f"Buy Feed ${GameConstants.GameEconomyConstants.FEED_COST}", Color.ORANGE, Color.BLACK),
+            'sell_eggs': Button(0, 0, button_width, button_height, "Sell All Eggs", Color.GREEN, Color.WHITE),
         }
-        self.blight_buttons = {
-            'buy_blight_cure': Button(button_x, button_y + 330, button_width, button_height, "Buy Blight Cure $200", Color.RED, Color.WHITE),
-            'cull_blighted_chickens': Button(button_x, button_y + 370, button_width, button_height, "Cull Blighted Chickens", Color.RED, Color.WHITE)
+        # Shown only while several plots are selected
+        self.bulk_buttons = {
+            'bulk_fill_feed': Button(0, 0, button_width, button_height, "Fill Feed (All)", Color.ORANGE, Color.BLACK),
+            'bulk_fill_chickens': Button(0, 0, button_width, button_height, "Fill Chickens (All)", Color.YELLOW, Color.BLACK),
+        }
+        for group in (self.buttons, self.bulk_buttons):
+            for key, button in group.items():
+                self.ui.add(button, self._button_action(key))
+        for button in self.bulk_buttons.values():
+            button.set_visible(False)
+        # Blight buttons are only shown once a blight breaks out; see the blight_buttons property
+        self._button_size = (button_width, button_height)
+        self._blight_buttons = None
+
+    def _button_action(self, key):
+        """Click handler for a sidebar button."""
+        def buy_chicken():
+            if self.selected_land:
+                self.dispatch(self.buy_chicken, self.selected_land)
+        actions = {
+            'buy_land': lambda: self.dispatch(self.buy_land),
+            'buy_chicken': buy_chicken,
+            'buy_feed': lambda: self.dispatch(self.buy_feed, self.selected_land),
+            'sell_eggs': lambda: self.dispatch(self.sell_eggs),
+            'upgrade_egg_capacity': lambda: self.dispatch(self.upgrade_egg_capacity),
+            'buy_blight_cure': lambda: self.dispatch(self.buy_blight_cure),
+            'cull_blighted_chickens': lambda: self.dispatch(self.cull_blighted_chickens),
+            'bulk_fill_feed': lambda: self.dispatch(self.bulk_fill_feed, list(self.selected_lands)),
+            'bulk_fill_chickens': lambda: self.dispatch(self.bulk_fill_chickens, list(self.selected_lands)),
         }
+        return actions[key]
+
+    def select_coop_type(self, coop_type_key):
+        """Place the chosen coop type on the current selection (the coop selector's on_select)."""
+        if self.selected_lands:
+            self.dispatch(self.bulk_place_coops, list(self.selected_lands), coop_type_key)
+        else:
+            self.dispatch(self.buy_coop, coop_type_key, self.selected_land)
+        # Close the panel after selection; done here so economy commands never touch the UI
+        if self.coop_selector_panel.is_expanded:
+            self.coop_selector_panel.toggle()
+
+    def layout_ui(self):
+        """Position the sidebar buttons and panels for the current window size."""
+        width, height = self.screen.get_size()
+        button_width = self._button_size[0]
+        # Centre the button column in the sidebar
+        self._button_origin = (width - (self.SIDEBAR_WIDTH + button_width) // 2, 20)
+        for group in (self.buttons, self.bulk_buttons, self._blight_buttons or {}):
+            for key, button in group.items():
+                button.move_to(*self._sidebar_position(key))
+        # Status text fills the space under the button column: anchored to the bottom edge as
+        # on the default window, squeezed evenly when the column leaves less room
+        column_bottom = self._button_origin[1] + max(self.SIDEBAR_OFFSETS.values()) + self._button_size[1]
+        status_top = max(height - self.STATUS_HEIGHT, column_bottom + 10)
+        scale = (height - status_top) / self.STATUS_HEIGHT
+        self._status_positions = {key: (width - 170, status_top + int(offset * scale))
+                                  for key, offset in self.STATUS_OFFSETS.items()}
+        # Panels stack down the left edge, each below the expanded extent of the one above;
+        # the metrics panel sits right of Coop Info
+        self.coop_info_panel.move_to(10, 10)
+        self.coop_selector_panel.move_to(10, self.coop_info_panel.panel_rect.bottom + 10)
+        self.automation_panel.move_to(10, self.coop_selector_panel.panel_rect.bottom + 10)
+        self.metrics_panel.move_to(270, 10)
+        self.camera.resize(width, height)
+        # Widgets may have moved under a still pointer
+        self.ui.on_motion(pygame.mouse.get_pos())
+
+    def min_height(self):
+        """Shortest window on which the panels clear the instructions and the status text fits under the buttons."""
+        column_bottom = self._button_origin[1] + max(self.SIDEBAR_OFFSETS.values()) + self._button_size[1]
+        return max(ScreenDimensions.MIN_HEIGHT,
+                   self.automation_panel.panel_rect.bottom + 10 + self.INSTRUCTIONS_HEIGHT,
+                   column_bottom + 10 + int(self.STATUS_HEIGHT * self.STATUS_MIN_SCALE))
+
+    def _sidebar_position(self, key):
+        x, y = self._button_origin
+        return x, y + self.SIDEBAR_OFFSETS[key]
+
+    @property
+    def blight_buttons(self):
+        if self._blight_buttons is None:
+            button_width, button_height = self._button_size
+            self._blight_buttons = {
+                'buy_blight_cure': Button(*self._sidebar_position('buy_blight_cure'), button_width, button_height, "Buy Blight Cure $200", Color.RED, Color.WHITE),
+                'cull_blighted_chickens': Button(*self._sidebar_position('cull_blighted_chickens'), button_width, button_height, "Cull Blighted Chickens", Color.RED, Color.WHITE)
+            }
+            for key, button in self._blight_buttons.items():
+                self.ui.add(button, self._button_action(key))
+        return self._blight_buttons
+
+    def resize(self, width, height):
+        """Adopt a new window size (clamped to the minimum) and re-layout."""
+        clamped = (max(width, ScreenDimensions.MIN_WIDTH), max(height, self.min_height()))
+        # SDL2 resizes the display surface itself unless we had to clamp (or the driver doesn't)
+        self.screen = pygame.display.get_surface()
+        if self.screen.get_size() != clamped:
+            self.screen = pygame.display.set_mode(clamped, pygame.RESIZABLE)
+        if self.vignette_effect.screen_width != clamped[0] or self.vignette_effect.screen_height != clamped[1]:
+            self.vignette_effect = VignetteEffect(*clamped)
+        self.layout_ui()
 
     def handle_events(self):
-        mouse_pos = pygame.mouse.get_pos()
-        for button in self.buttons.values():
-            button.update_hover(mouse_pos)
-        for button in self.blight_buttons.values():
-            button.update_hover(mouse_pos)
-        self.coop_info_panel.update_hover(mouse_pos)
-        self.coop_selector_panel.update_hover(mouse_pos)
-        for event in pygame.event.get():
+        # Hover and clicks go through the widget tree and only happen on pointer events
+        for event in self.pacer.take_events():
+            self.pacer.note_input()
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.VIDEORESIZE:
+                self.resize(event.w, event.h)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 # left click
                 if event.button == 1:
-                    if self.coop_info_panel.is_toggle_clicked(mouse_pos):
-                        self.coop_info_panel.toggle()
-                    elif self.coop_selector_panel.is_toggle_clicked(mouse_pos):
-                        self.coop_selector_panel.toggle()
-                    else:
-                        self.handle_clicks(mouse_pos)
+                    self.handle_clicks(event.pos)
                 # right-click: start drag (we'll implement pan later)
+            elif event.type == pygame.MOUSEMOTION:
+                self.ui.on_motion(event.pos)
+                if self.drag_start is not None:
+                    self.drag_rect = self._rect_from_points(self.drag_start, event.pos)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self.drag_start is not None:
+                rect = self._rect_from_points(self.drag_start, event.pos)
+                self.drag_start = None
+                self.drag_rect = None
+                if rect.width >= self.DRAG_THRESHOLD or rect.height >= self.DRAG_THRESHOLD:
+                    self.selected_lands = self.lands_in_screen_rect(rect)
+                    self.selected_land = None
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     self.state = self.GameState.PAUSED if self.state == self.GameState.PLAYING else self.GameState.PLAYING
+                    if self.simulation is not None:
+                        self.simulation.wake()  # Resume promptly from its paused wait
+                elif event.key == pygame.K_F3 and MEMORY_MONITOR.started:
+                    MEMORY_MONITOR.overlay_visible = not MEMORY_MONITOR.overlay_visible
 
     def handle_clicks(self, mouse_pos):
-        # Check for coop selection first (highest priority)
-        selected_coop_type = self.coop_selector_panel.get_clicked_option(mouse_pos)
-        if selected_coop_type is not None:
-            self.buy_coop(selected_coop_type)
-            return
-        
-        # Check regular buttons
-        if self.buttons['buy_land'].is_clicked(mouse_pos):
-            self.buy_land()
-            return
-        elif self.buttons['buy_chicken'].is_clicked(mouse_pos):
-            if self.selected_land:
-                self.buy_chicken()
-            return
-        elif self.buttons['buy_feed'].is_clicked(mouse_pos):
-            self.buy_feed()
-            return
-        elif self.buttons['sell_eggs'].is_clicked(mouse_pos):
-            self.sell_eggs()
-            return
-        elif self.buttons['upgrade_egg_capacity'].is_clicked(mouse_pos):
-            if self.money >= self.expanded_capacity_price:
-                self.money -= self.expanded_capacity_price
-                self.egg_capacity += 100.0
-                self.expanded_capacity_price += 100
-            return
-        elif self.blight_buttons['buy_blight_cure'].is_clicked(mouse_pos):
-            if any(land.coop.has_blight() for land in self.lands if land.coop) and self.money >= 200:
-                self.money -= 200
-                for land in self.lands:
-                    if land.coop:
-                        land.coop.blight_active = False
+        # Widgets (panel toggles, coop options, sidebar buttons) run their own handlers
+        if self.ui.on_click(mouse_pos) is not None:
             return
-        elif self.blight_buttons['cull_blighted_chickens'].is_clicked(mouse_pos):
-            if any(land.coop.has_blight() for land in self.lands if land.coop):
-                for land in self.lands:
-                    if land.coop:
-                        land.coop.chickens.clear()
-                        land.coop.blight_active = False
-            return
-        else:
-            # Convert screen→world and select land
-            world_mouse = self.camera.screen_to_world(mouse_pos)
-            for land in self.lands:
-                if land.contains_point(world_mouse):
-                    # If this land is occupied by a multi-tile coop, select the land that owns the coop
-                    if land.coop_occupying_land:
-                        # Find the land that owns this coop
-                        for owner_land in self.lands:
-                            if owner_land.coop is land.coop_occupying_land:
-                                self.selected_land = owner_land
-                                return
-                    self.selected_land = land
-                    return
+        # A press on the map may turn into a drag-rectangle selection on release
+        self.drag_start = mouse_pos
+        self.selected_lands = []
+        # Convert screen→world and select land
+        world_mouse = self.camera.screen_to_world(mouse_pos)
+        for land in self.lands:
+            if land.contains_point(world_mouse):
+                # If this land is occupied by a multi-tile coop, select the land that owns the coop
+                if land.coop_occupying_land:
+                    # Find the land that owns this coop
+                    for owner_land in self.lands:
+                        if owner_land.coop is land.coop_occupying_land:
+                            self.selected_land = owner_land
+                            return
+                self.selected_land = land
+                return
+
+    # Minimum drag size in pixels before a press counts as a rectangle selection
+    DRAG_THRESHOLD = 8
+
+    @staticmethod
+    def _rect_from_points(a, b):
+        return pygame.Rect(min(a[0], b[0]), min(a[1], b[1]), abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+    def add_land(self, row, col):
+        land = Land(0, 0, row=row, col=col)
+        self.lands.append(land)
+        self.land_grid[(row, col)] = land
+        self.draw_order.add_land(land)
+        return land
+
+    def lands_in_screen_rect(self, rect):
+        """Return the lands whose tile centre lies inside a screen-space rect.
+
+        The rect's corners are mapped to grid space to bound the candidate cells, so the query
+        touches only the grid cells under the rectangle rather than every land.
+        """
+        corners = [rect.topleft, rect.topright, rect.bottomleft, rect.bottomright]
+        grid = world_to_grid_many(self.camera.screen_to_world_many(corners))
+        row_min, col_min = (math.floor(v) for v in grid.min(axis=0))
+        row_max, col_max = (math.ceil(v) for v in grid.max(axis=0))
+        candidates = [
+            self.land_grid[(row, col)]
+            for row in range(row_min, row_max + 1)
+            for col in range(col_min, col_max + 1)
+            if (row, col) in self.land_grid
+        ]
+        if not candidates:
+            return []
+        centres = self.camera.world_to_screen_many(
+            grid_to_world_many([l.row for l in candidates], [l.col for l in candidates]))
+        inside = ((centres[:, 0] >= rect.left) & (centres[:, 0] < rect.right)
+                  & (centres[:, 1] >= rect.top) & (centres[:, 1] < rect.bottom))
+        return [land for land, hit in zip(candidates, inside) if hit]
+
+    @staticmethod
+    def _unique_coops(lands):
+        """Coops on or occupying the given lands, each once (multi-slot coops span two lands)."""
+        coops = {}
+        for land in lands:
+            coop = land.coop or land.coop_occupying_land
+            if coop is not None:
+                coops[id(coop)] = coop
+        return list(coops.values())
+
+    # Player commands return True if they changed the farm, False if unaffordable or not applicable
 
     def buy_land(self):
         if self.money >= GameConstants.GameEconomyConstants.LAND_COST:
@@ -185,85 +425,201 @@ class Game:
             cols = 4
             row = land_count // cols
             col = land_count % cols
-            self.lands.append(Land(0, 0, row=row, col=col))
+            self.add_land(row, col)
             self.money -= GameConstants.GameEconomyConstants.LAND_COST
+            return True
+        return False
 
-    def buy_coop(self, coop_type_key=None):
-        if not self.selected_land or self.selected_land.coop or self.selected_land.coop_occupying_land:
-            return
+    def buy_coop(self, coop_type_key=None, land=None):
+        land = land or self.selected_land
+        if not land or land.coop or land.coop_occupying_land:
+            return False
         
         # Get coop type from selector
         if coop_type_key is None:
-            return
+            return False
         
-        coop_types = {
-            "classic": GameConstants.CoopTypes.CLASSIC,
-            "deluxe": GameConstants.CoopTypes.DELUXE,
-        }
-        coop_type = coop_types.get(coop_type_key)
+        coop_type = REGISTRY.coop(coop_type_key)
         if coop_type is None:
-            return
-        
-        coop_cost = coop_type.get("cost", 100)
-        land_slots_needed = coop_type.get("land_slots", 1)
+            return False
         
         # Check if we have enough adjacent slots for multi-slot coops
-        if land_slots_needed > 1:
-            # For deluxe coop, check if the land to the right is available
-            adjacent_col = self.selected_land.col + 1
-            adjacent_land = None
-            for land in self.lands:
-                if land.row == self.selected_land.row and land.col == adjacent_col:
-                    adjacent_land = land
-                    break
-            
+        adjacent_lands = [self.land_grid.get((land.row + dr, land.col + dc)) for dr, dc in coop_type.footprint[1:]]
+        for adjacent_land in adjacent_lands:
             if not adjacent_land or adjacent_land.coop or adjacent_land.coop_occupying_land:
                 # Not enough free adjacent land
-                return
+                return False
         
-        if self.money >= coop_cost:
-            self.money -= coop_cost
+        if self.money >= coop_type.cost:
+            self.money -= coop_type.cost
             coop = Coop(coop_type=coop_type)
-            self.selected_land.coop = coop
+            land.coop = coop
+            self.flock.register_coop(coop, self._coop_anchor(land, coop))
             
             # If multi-slot, mark adjacent land as occupied
-            if land_slots_needed > 1:
-                adjacent_col = self.selected_land.col + 1
-                for land in self.lands:
-                    if land.row == self.selected_land.row and land.col == adjacent_col:
-                        land.coop_occupying_land = coop
-                        break
-            
-            self.coop_selector_panel.toggle()  # Close the panel after selection
-
-    def buy_chicken(self):
-        if not self.selected_land:
-            return
-        if self.money >= GameConstants.GameEconomyConstants.CHICKEN_COST and self.selected_land.coop:
-            tile_w = GameConstants.LAND_SIZE
-            tile_h = GameConstants.LAND_SIZE // 2
-            off_x = random.uniform(-tile_w * 0.25, tile_w * 0.25)
-            off_y = random.uniform(0, tile_h * 0.4)
-            self.selected_land.coop.chickens.append(Chicken(off_x, off_y))
-            self.money -= GameConstants.GameEconomyConstants.CHICKEN_COST
+            for adjacent_land in adjacent_lands:
+                adjacent_land.coop_occupying_land = coop
+            self.draw_order.add_coop(land)
+            return True
+        return False
+
+    def buy_chicken(self, land=None):
+        land = land or self.selected_land
+        if not land:
+            return False
+        if land.coop and self.money >= land.coop.coop_type.breed.cost:
+            land.coop.chickens.append(self._new_chicken(land.coop))
+            land.coop.version += 1
+            self.money -= land.coop.coop_type.breed.cost
+            return True
+        return False
+
+    def _new_chicken(self, coop):
+        tile_w = GameConstants.LAND_SIZE
+        tile_h = GameConstants.LAND_SIZE // 2
+        off_x = self._cosmetic_random.uniform(-tile_w * 0.25, tile_w * 0.25)
+        off_y = self._cosmetic_random.uniform(0, tile_h * 0.4)
+        chicken = Chicken(off_x, off_y)
+        self.flock.add(chicken, coop)
+        return chicken
+
+    @staticmethod
+    def _coop_anchor(land, coop):
+        """World point Coop.draw passes to its chickens (multi-tile coops centre between tiles)."""
+        wx, wy = grid_to_world(land.row, land.col)
+        return wx + coop.coop_type.anchor_offset_x, wy
 
     def sell_eggs(self):
         if self.total_eggs > 0:
             money_earned = self.total_eggs * GameConstants.GameEconomyConstants.EGG_SELL_PRICE
             self.money += money_earned
             self.total_eggs = 0
-
-    def buy_feed(self):
-        """Buy feed for the selected coop."""
-        if not self.selected_land or not self.selected_land.coop:
-            return
+            self.particles.emit(ParticleSystem.COIN, self.flock.anchors(), ParticleConstants.SELL_COINS_PER_COOP)
+            return True
+        return False
+
+    def buy_feed(self, land=None):
+        """Buy feed for the given coop (defaults to the selected one)."""
+        land = land or self.selected_land
+        if not land or not land.coop:
+            return False
         if self.money >= GameConstants.GameEconomyConstants.FEED_COST:
             self.money -= GameConstants.GameEconomyConstants.FEED_COST
-            self.selected_land.coop.buy_feed(50.0)  # Add 50% feed capacity
+            land.coop.buy_feed(GameConstants.FeedConstants.FEED_BAG_SIZE)  # Add 50% feed capacity
+            return True
+        return False
+
+    # Bulk actions: each plans the whole change first, checks money once and applies it as one
+    # transaction. If the player can't afford all of it, nothing happens. Each returns the number
+    # of coops (or plots) changed.
+
+    def bulk_fill_feed(self, lands, target=GameConstants.FeedConstants.BULK_FEED_TARGET):
+        """Top up every selected coop to target % using whole feed bags."""
+        bag = GameConstants.FeedConstants.FEED_BAG_SIZE
+        plan = []
+        bags = 0
+        for coop in self._unique_coops(lands):
+            if coop.feed_level < target:
+                needed = math.ceil((target - coop.feed_level) / bag)
+                plan.append((coop, needed))
+                bags += needed
+        cost = bags * GameConstants.GameEconomyConstants.FEED_COST
+        if not plan or self.money < cost:
+            return 0
+        self.money -= cost
+        for coop, needed in plan:
+            coop.buy_feed(needed * bag)
+        return len(plan)
+
+    def bulk_fill_chickens(self, lands):
+        """Buy chickens until every selected coop is at capacity."""
+        plan = []
+        cost = 0
+        for coop in self._unique_coops(lands):
+            missing = coop.coop_type.capacity - len(coop.chickens)
+            if missing > 0:
+                plan.append((coop, missing))
+                cost += missing * coop.coop_type.breed.cost
+        if not plan or self.money < cost:
+            return 0
+        self.money -= cost
+        for coop, missing in plan:
+            coop.chickens.extend(self._new_chicken(coop) for _ in range(missing))
+            coop.version += 1
+        return len(plan)
+
+    def bulk_place_coops(self, lands, coop_type_key):
+        """Place a coop of the given type on every free selected plot that can hold one."""
+        coop_type = REGISTRY.coop(coop_type_key)
+        if coop_type is None:
+            return 0
+        claimed = set()
+        plan = []
+        for land in sorted(lands, key=lambda l: (l.row, l.col)):
+            footprint = [self.land_grid.get((land.row + dr, land.col + dc)) for dr, dc in coop_type.footprint]
+            if all(l is not None and not l.coop and not l.coop_occupying_land and (l.row, l.col) not in claimed
+                   for l in footprint):
+                plan.append(footprint)
+                claimed.update((l.row, l.col) for l in footprint)
+        cost = len(plan) * coop_type.cost
+        if not plan or self.money < cost:
+            return 0
+        self.money -= cost
+        for footprint in plan:
+            coop = Coop(coop_type=coop_type)
+            footprint[0].coop = coop
+            self.flock.register_coop(coop, self._coop_anchor(footprint[0], coop))
+            for extra in footprint[1:]:
+                extra.coop_occupying_land = coop
+            self.draw_order.add_coop(footprint[0])
+        return len(plan)
+
+    def upgrade_egg_capacity(self):
+        if self.money >= self.expanded_capacity_price:
+            self.money -= self.expanded_capacity_price
+            self.egg_capacity += 100.0
+            self.expanded_capacity_price += 100
+            return True
+        return False
+
+    def buy_blight_cure(self):
+        if any(land.coop.has_blight() for land in self.lands if land.coop) and self.money >= 200:
+            self.money -= 200
+            for land in self.lands:
+                if land.coop:
+                    land.coop.blight_active = False
+                    land.coop.version += 1
+            return True
+        return False
 
-    def update(self, dt):
-        if self.state == self.GameState.PAUSED:
-            return
+    def cull_blighted_chickens(self):
+        if any(land.coop.has_blight() for land in self.lands if land.coop):
+            for land in self.lands:
+                if land.coop:
+                    land.coop.chickens.clear()
+                    land.coop.blight_active = False
+                    land.coop.version += 1
+            return True
+        return False
+
+    def advance_simulation(self, dt):
+        """Step the economy in fixed 1/tick_rate increments so frame pacing never changes its results."""
+        step = 1.0 / self.tick_rate
+        self._sim_accumulator += dt
+        while self._sim_accumulator >= step:
+            self.step_simulation(step)
+            self._sim_accumulator -= step
+
+    def is_panning(self):
+        keys = pygame.key.get_pressed()
+        return any(keys[k] for k in (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+                                     pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN))
+
+    def has_focus(self):
+        """False when the window is minimized or another window has keyboard focus."""
+        return pygame.display.get_active() and pygame.key.get_focused()
+
+    def update_camera(self, dt):
         # camera pan with WASD
         keys = pygame.key.get_pressed()
         dx = 0.0
@@ -280,79 +636,148 @@ class Game:
         self.camera.x += dx
         self.camera.y += dy
 
+    def step_simulation(self, dt):
+        """Advance the economy by dt seconds. Touches no pygame state, so it may run off the main thread."""
         self.game_time += dt
-        self.lighting_system.update(self.game_time)
+        if self._weather is not None and self._weather.update_coops(self.lands, self.game_time):
+            # Production rates changed, so rule predictions made from the old ones are stale
+            self.rules.invalidate()
 
         for land in self.lands:
             if land.coop:
-                land.coop.calculate_blight_chance(dt)
+                if land.coop.calculate_blight_chance(dt):
+                    self.rules.wake("blight", self.game_time)
                 land.coop.update_feed(dt)  # Update feed level and handle starvation
-                production_rate = land.coop.get_total_production_rate()
-                eggs_produced = int(production_rate * dt)
-                land.coop.eggs_produced += eggs_produced
+                # Whole eggs are laid as the fractional remainder builds up across steps. Blight's
+                # negative rate only drains the remainder: a blighted coop lays nothing but never
+                # takes eggs away
+                land.coop.egg_progress = max(0.0, land.coop.egg_progress + land.coop.get_total_production_rate() * dt)
+                eggs_produced = int(land.coop.egg_progress)
+                if eggs_produced:
+                    land.coop.egg_progress -= eggs_produced
+                    land.coop.eggs_produced += eggs_produced
+                    land.coop.version += 1
+                if eggs_produced > 0:
+                    self.particles.emit(ParticleSystem.EGG, self.flock.anchor_of(land.coop), eggs_produced)
                 if (self.total_eggs + eggs_produced <= self.egg_capacity):
                     self.total_eggs += eggs_produced
                 else:
                     self.total_eggs = self.egg_capacity
 
-    def draw(self):
-        self.screen.fill(Color.LIGHT_BROWN)
-        for land in self.lands:
-            land.is_selected = (land is self.selected_land)
-        for land in sorted(self.lands, key=lambda l: (l.row + l.col)):
-            land.draw(self.screen, self.camera)
-
-        # Apply lighting tint and vignette
-        self.lighting_system.apply_tint_to_screen(self.screen)
+        self.rules.tick(self)
+        self.metrics.sample_if_due(self)
+
+    def draw(self, view=None):
+        """Render a frame.
+
+        Args:
+            view: State to present; a SimulationSnapshot in threaded mode, otherwise the game itself
+        """
+        if view is None:
+            view = self
+        selected_land = self.selected_land
+        selected_lands = self.selected_lands
+        if view is not self:
+            if selected_land is not None:
+                selected_land = view.land_views.get(id(selected_land))
+            selected_lands = [view.land_views[id(l)] for l in selected_lands if id(l) in view.land_views]
+        multi_selected = {id(l) for l in selected_lands}
+
+        for land in view.lands:
+            land.is_selected = (land is selected_land) or id(land) in multi_selected
+        if self.render_scale < 1.0:
+            camera = self.camera.scaled(self.render_scale)
+            if self._world_layer is None or self._world_layer.get_size() != (camera.width, camera.height):
+                self._world_layer = pygame.Surface((camera.width, camera.height)).convert()
+            self._draw_world(self._world_layer, camera, view)
+            pygame.transform.scale(self._world_layer, self.screen.get_size(), self.screen)
+        else:
+            self._draw_world(self.screen, self.camera, view)
         self.vignette_effect.apply_vignette(self.screen)
+        width, height = self.screen.get_size()
+
+        if self.drag_rect is not None:
+            pygame.draw.rect(self.screen, Color.YELLOW, self.drag_rect, 1)
 
         # Draw coop info panel
         panel_metrics = {}
-        if self.selected_land and self.selected_land.coop:
-            coop = self.selected_land.coop
+        if selected_lands:
+            coops = self._unique_coops(selected_lands)
+            panel_metrics = {
+                "Plots": str(len(selected_lands)),
+                "Coops": str(len(coops)),
+                "Chickens": str(sum(len(c.chickens) for c in coops)),
+                "Min feed": f"{min((c.feed_level for c in coops), default=0.0):.1f}%",
+            }
+        elif selected_land and selected_land.coop:
+            coop = selected_land.coop
             panel_metrics = {
                 "Chickens": str(len(coop.chickens)),
                 "Eggs": f"{coop.eggs_produced:.1f}",
                 "Feed": f"{coop.feed_level:.1f}%",
             }
         self.coop_info_panel.draw(self.screen, self.font_small, panel_metrics)
+        # Hidden widgets drop out of hit-testing; set_visible is a no-op when nothing changed
+        self.automation_panel.set_visible(bool(self.rules.rules))
+        if self.rules.rules:
+            self.automation_panel.draw(self.screen, self.font_small, {
+                rule.name: f"{rule.stats.firings} fired, {rule.stats.failures} failed"
+                for rule in self.rules.rules
+            })
+        metric_series = None
+        if self.metrics_panel.is_expanded:
+            metric_series = {
+                name: self.metrics.series(name)[1][-MetricsConstants.SPARKLINE_POINTS:]
+                for name in MetricsRecorder.METRICS
+            }
+        self.metrics_panel.draw(self.screen, self.font_small, metric_series)
 
-        pygame.draw.rect(self.screen, Color.GRAY, (ScreenDimensions.SCREEN_WIDTH - 180, 0, 180, ScreenDimensions.SCREEN_HEIGHT))
+        pygame.draw.rect(self.screen, Color.GRAY, (width - self.SIDEBAR_WIDTH, 0, self.SIDEBAR_WIDTH, height))
         
         # Draw coop selector panel AFTER the sidebar so it appears on top
-        if self.selected_land and not self.selected_land.coop:
+        show_selector = bool((selected_land and not selected_land.coop) or any(
+                not l.coop and not l.coop_occupying_land for l in selected_lands))
+        self.coop_selector_panel.set_visible(show_selector)
+        if show_selector:
             self.coop_selector_panel.draw(self.screen, self.font_small)
         
         for button in self.buttons.values():
             button.draw(self.screen, self.font_small)
-        if any(land.coop.has_blight() for land in self.lands if land.coop):
-            for button in self.blight_buttons.values():
+        for button in self.bulk_buttons.values():
+            button.set_visible(bool(selected_lands))
+            if selected_lands:
                 button.draw(self.screen, self.font_small)
+        blight = any(land.coop.has_blight() for land in view.lands if land.coop)
+        if blight or self._blight_buttons is not None:
+            for button in self.blight_buttons.values():
+                button.set_visible(blight)
+                if blight:
+                    button.draw(self.screen, self.font_small)
 
 
-        money_text = self.font_medium.render(f"Money: ${self.money:.2f}", True, Color.YELLOW)
-        self.screen.blit(money_text, (ScreenDimensions.SCREEN_WIDTH - 170, ScreenDimensions.SCREEN_HEIGHT - 150))
-        eggs_text = self.font_medium.render(f"Eggs: {self.total_eggs:.1f}", True, Color.ORANGE)
-        self.screen.blit(eggs_text, (ScreenDimensions.SCREEN_WIDTH - 170, ScreenDimensions.SCREEN_HEIGHT - 110))
-        time_text = self.font_small.render(f"Time: {self.game_time:.1f}s", True, Color.WHITE)
-        self.screen.blit(time_text, (ScreenDimensions.SCREEN_WIDTH - 170, ScreenDimensions.SCREEN_HEIGHT - 70))
+        money_text = self.font_medium.render(f"Money: ${view.money:.2f}", True, Color.YELLOW)
+        self.screen.blit(money_text, self._status_positions['money'])
+        eggs_text = self.font_medium.render(f"Eggs: {view.total_eggs:.1f}", True, Color.ORANGE)
+        self.screen.blit(eggs_text, self._status_positions['eggs'])
+        time_text = self.font_small.render(f"Time: {view.game_time:.1f}s", True, Color.WHITE)
+        self.screen.blit(time_text, self._status_positions['time'])
 
-        if any(land.coop.has_blight() for land in self.lands if land.coop):
+        if blight:
             blight_text = self.font_medium.render("BLIGHT ACTIVE!", True, Color.RED)
-            self.screen.blit(blight_text, (ScreenDimensions.SCREEN_WIDTH - 170, ScreenDimensions.SCREEN_HEIGHT - 200))
-        if self.selected_land:
+            self.screen.blit(blight_text, self._status_positions['blight'])
+        if selected_land:
             info = "Selected"
-            if self.selected_land.coop:
-                chickens = len(self.selected_land.coop.chickens)
+            if selected_land.coop:
+                chickens = len(selected_land.coop.chickens)
                 info += f" Coop ({chickens}🐔)"
             else:
                 info += " (empty)"
             selected_text = self.font_small.render(info, True, Color.YELLOW)
-            self.screen.blit(selected_text, (ScreenDimensions.SCREEN_WIDTH - 170, ScreenDimensions.SCREEN_HEIGHT - 30))
+            self.screen.blit(selected_text, self._status_positions['selected'])
 
         if self.state == self.GameState.PAUSED:
             pause_text = self.font_large.render("PAUSED", True, Color.RED)
-            pause_rect = pause_text.get_rect(center=(ScreenDimensions.SCREEN_WIDTH // 2, ScreenDimensions.SCREEN_HEIGHT // 2))
+            pause_rect = pause_text.get_rect(center=(width // 2, height // 2))
             pygame.draw.rect(self.screen, Color.BLACK, pause_rect.inflate(20, 20))
             self.screen.blit(pause_text, pause_rect)
 
@@ -365,14 +790,65 @@ class Game:
         ]
         for i, instruction in enumerate(instructions):
             instr_text = self.font_small.render(instruction, True, Color.WHITE)
-            self.screen.blit(instr_text, (10, ScreenDimensions.SCREEN_HEIGHT - 100 + i * 20))
+            self.screen.blit(instr_text, (10, height - self.INSTRUCTIONS_HEIGHT + i * 20))
+
+        if MEMORY_MONITOR.overlay_visible:
+            MEMORY_MONITOR.draw_overlay(self.screen, self.font_small)
 
         pygame.display.flip()
 
+    def _draw_world(self, surface, camera, view):
+        """Draw the map, effects, weather and lighting tint: everything that render_scale applies to."""
+        surface.fill(Color.LIGHT_BROWN)
+        land_views = view.land_views if view is not self else None
+        for land, is_structure in view.draw_order:
+            if land_views is not None:
+                land = land_views[id(land)]
+            if is_structure:
+                land.draw_structure(surface, camera)
+            else:
+                land.draw_tile(surface, camera)
+        self.particles.draw(surface, camera)
+        weather_overlay = self._weather.render_overlay(camera, view.game_time) if self._weather is not None else None
+        self.lighting_system.apply_tint_to_screen(surface, weather_overlay)
+
     def run(self):
-        while self.running:
-            dt = self.clock.tick(60) / 1000.0
-            self.handle_events()
-            self.update(dt)
-            self.draw()
+        """Main loop. Sleeps according to self.pacer; the economy is either stepped here in fixed
+        increments or, in threaded mode, ticks on self.simulation while this loop presents the
+        latest interpolated snapshot."""
+        if self.simulation is not None:
+            self.simulation.start()
+        # Don't count construction time as the first frame's dt
+        self.clock.tick()
+        try:
+            while self.running:
+                was_paused = self.state == self.GameState.PAUSED
+                dt = self.pacer.wait(background=was_paused or not self.has_focus(), panning=self.is_panning())
+                frame_start = time.perf_counter()
+                self.handle_events()
+                # Time spent blocked while paused must not be simulated after unpausing
+                if not was_paused and self.state == self.GameState.PLAYING:
+                    self.update_camera(dt)
+                    self.flock.step(dt, self.camera)
+                    self.particles.update(dt)
+                    if self.simulation is None:
+                        self.advance_simulation(dt)
+
+                if self.simulation is not None:
+                    view = self.simulation.interpolated()
+                else:
+                    view = self
+                self.lighting_system.update(view.game_time)
+                if self.pacer.should_redraw(paused=self.state == self.GameState.PAUSED):
+                    self.draw(view)
+                    STARTUP_TRACE.first_frame()
+                    MEMORY_MONITOR.frame()
+                    if self.render_scale_controller is not None:
+                        # Work time only: the pacer's sleep is not something lower resolution can save
+                        work_ms = (time.perf_counter() - frame_start) * 1000.0
+                        self.render_scale = self.render_scale_controller.update(work_ms)
+        finally:
+            if self.simulation is not None:
+                self.simulation.stop()
+                self.simulation.join()
         pygame.quit()
@@ -2,11 +2,26 @@
 import pygame
 from Constants import LightingConstants, ScreenDimensions
 import math
+import threading
+import numpy as np
 
 
 class ShadowManager:
     """Handles drawing drop shadows beneath game entities."""
-    
+    # (width, height) -> pre-rendered shadow surface, filled lazily on first use
+    _shadow_cache = {}
+
+    @classmethod
+    def get_shadow_surface(cls, width, height):
+        """Return the cached shadow ellipse surface for this size, creating it on first use."""
+        surface = cls._shadow_cache.get((width, height))
+        if surface is None:
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            shadow_color = (0, 0, 0, LightingConstants.SHADOW_ALPHA)
+            pygame.draw.ellipse(surface, shadow_color, surface.get_rect())
+            cls._shadow_cache[(width, height)] = surface
+        return surface
+
     @staticmethod
     def draw_shadow(screen, screen_x, screen_y, width, height, offset_y=0):
         """
@@ -28,12 +43,7 @@ class ShadowManager:
             max(2, height // 4)
         )
         
-        # Create a surface for the shadow with per-pixel alpha
-        shadow_surface = pygame.Surface((shadow_rect.width, shadow_rect.height), pygame.SRCALPHA)
-        shadow_color = (0, 0, 0, LightingConstants.SHADOW_ALPHA)
-        pygame.draw.ellipse(shadow_surface, shadow_color, shadow_surface.get_rect())
-        
-        # Blur effect: draw it twice to soften edges
+        shadow_surface = ShadowManager.get_shadow_surface(shadow_rect.width, shadow_rect.height)
         screen.blit(shadow_surface, shadow_rect)
 
 
@@ -85,11 +95,18 @@ class LightingSystem:
             int(color1[2] * (1 - t) + color2[2] * t)
         )
     
-    def apply_tint_to_screen(self, screen):
+    def apply_tint_to_screen(self, screen, weather_overlay=None):
         """
         Apply the current lighting tint to the entire screen.
         Creates a subtle color overlay for time-of-day effect.
+
+        Args:
+            screen: pygame surface to draw on
+            weather_overlay: optional screen-sized cloud/rain surface, drawn beneath the tint
+                so weather takes on the time-of-day colour
         """
+        if weather_overlay is not None:
+            screen.blit(weather_overlay, (0, 0))
         # Create a tint surface
         tint_surface = pygame.Surface((screen.get_width(), screen.get_height()))
         tint_surface.fill(self.current_tint)
@@ -98,16 +115,26 @@ class LightingSystem:
 
 
 class VignetteEffect:
-    """Creates a darkened vignette around screen edges."""
+    """Creates a darkened vignette around screen edges.
+
+    The surface is baked on a background thread so it doesn't delay the first frame;
+    apply_vignette() is a no-op until the bake has finished.
+    """
     
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, background=True):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self._create_vignette_surface()
+        self.vignette_surface = None
+        if background:
+            self._bake_thread = threading.Thread(target=self._create_vignette_surface, name="vignette-bake", daemon=True)
+            self._bake_thread.start()
+        else:
+            self._bake_thread = None
+            self._create_vignette_surface()
     
     def _create_vignette_surface(self):
         """Pre-render the vignette effect surface."""
-        self.vignette_surface = pygame.Surface(
+        surface = pygame.Surface(
             (self.screen_width, self.screen_height),
             pygame.SRCALPHA
         )
@@ -117,19 +144,25 @@ class VignetteEffect:
         center_y = self.screen_height // 2
         max_distance = math.sqrt(center_x**2 + center_y**2)
         
-        for x in range(self.screen_width):
-            for y in range(self.screen_height):
-                dx = x - center_x
-                dy = y - center_y
-                distance = math.sqrt(dx**2 + dy**2)
-                
-                # Vignette strength increases toward edges
-                vignette_strength = (distance / max_distance) ** 1.5
-                vignette_strength = min(1.0, vignette_strength * LightingConstants.VIGNETTE_STRENGTH)
-                
-                alpha = int(255 * vignette_strength)
-                self.vignette_surface.set_at((x, y), (0, 0, 0, alpha))
+        # Indexed [x, y] to match surfarray layout
+        dx = np.arange(self.screen_width, dtype=np.float64)[:, None] - center_x
+        dy = np.arange(self.screen_height, dtype=np.float64)[None, :] - center_y
+        distance = np.sqrt(dx**2 + dy**2)
+        
+        # Vignette strength increases toward edges
+        vignette_strength = (distance / max_distance) ** 1.5
+        vignette_strength = np.minimum(1.0, vignette_strength * LightingConstants.VIGNETTE_STRENGTH)
+        
+        surface.fill((0, 0, 0, 0))
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[:] = (255 * vignette_strength).astype(np.uint8)
+        del alpha  # release the surface lock
+        self.vignette_surface = surface
+
+    def is_ready(self):
+        return self.vignette_surface is not None
     
     def apply_vignette(self, screen):
         """Apply the vignette effect to the screen."""
-        screen.blit(self.vignette_surface, (0, 0))
+        if self.vignette_surface is not None:
+            screen.blit(self.vignette_surface, (0, 0))
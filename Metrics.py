@@ -0,0 +1,113 @@
+"""Bounded multi-resolution recorder for farm metrics."""
+import csv
+import numpy as np
+from Constants import MetricsConstants
+
+
+class MetricTier:
+    """Fixed-size ring buffer of samples at one resolution.
+
+    Each row is [game_time, metric_0, metric_1, ...]. Once full, the oldest row is overwritten.
+    """
+
+    def __init__(self, interval, capacity, width):
+        self.interval = interval
+        self.capacity = capacity
+        self.data = np.zeros((capacity, width), dtype=np.float64)
+        self.head = 0  # Next row to write
+        self.count = 0
+        # Running sum of rows pushed since the coarser tier last took a sample
+        self._pending_sum = np.zeros(width, dtype=np.float64)
+        self.pending_count = 0
+
+    def push(self, row):
+        self.data[self.head] = row
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self._pending_sum += row
+        self.pending_count += 1
+
+    def take_pending_mean(self):
+        mean = self._pending_sum / self.pending_count
+        self._pending_sum[:] = 0.0
+        self.pending_count = 0
+        return mean
+
+    def rows(self):
+        """Return the stored rows in chronological order (a copy)."""
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return np.concatenate((self.data[self.head:], self.data[:self.head]))
+
+
+class MetricsRecorder:
+    """Samples farm metrics into round-robin tiers so memory stays constant regardless of uptime.
+
+    The finest tier takes one sample per interval of game time. Each coarser tier stores the
+    mean of the finer samples that fall inside its own interval (for example 60 one-second
+    samples become one one-minute sample). Calling sample_if_due every tick costs one float
+    comparison until a sample is due.
+    """
+    METRICS = ("money", "total_eggs", "production_rate", "avg_feed", "blighted_coops")
+
+    def __init__(self, tiers=MetricsConstants.TIERS):
+        width = 1 + len(self.METRICS)
+        self.tiers = [MetricTier(interval, capacity, width) for interval, capacity in tiers]
+        self._next_sample = 0.0
+
+    def sample_if_due(self, game):
+        if game.game_time < self._next_sample:
+            return
+        self._next_sample = game.game_time + self.tiers[0].interval
+        self.record(game.game_time, self._collect(game))
+
+    @staticmethod
+    def _collect(game):
+        production_rate = 0.0
+        feed_total = 0.0
+        blighted = 0
+        coops = 0
+        for land in game.lands:
+            coop = land.coop
+            if coop:
+                coops += 1
+                production_rate += coop.get_total_production_rate()
+                feed_total += coop.feed_level
+                blighted += coop.blight_active
+        avg_feed = feed_total / coops if coops else 0.0
+        return (game.money, game.total_eggs, production_rate, avg_feed, blighted)
+
+    def record(self, game_time, values):
+        row = np.empty(1 + len(values), dtype=np.float64)
+        row[0] = game_time
+        row[1:] = values
+        self.tiers[0].push(row)
+        # Roll finished windows up into the coarser tiers
+        for finer, coarser in zip(self.tiers, self.tiers[1:]):
+            if finer.pending_count * finer.interval < coarser.interval:
+                break
+            coarser.push(finer.take_pending_mean())
+
+    def series(self, metric, tier=0):
+        """Return (times, values) arrays for one metric, oldest first."""
+        rows = self.tiers[tier].rows()
+        column = 1 + self.METRICS.index(metric)
+        return rows[:, 0], rows[:, column]
+
+    def export_csv(self, path, tier=0):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("game_time",) + self.METRICS)
+            writer.writerows(self.tiers[tier].rows().tolist())
+
+    def export_binary(self, path):
+        """Save every tier to a NumPy .npz archive (tier_<interval>s arrays plus column names)."""
+        arrays = {f"tier_{tier.interval:g}s": tier.rows() for tier in self.tiers}
+        np.savez_compressed(path, columns=np.array(("game_time",) + self.METRICS), **arrays)
+
+    def export(self, path):
+        """Export by file extension: .csv writes the finest tier, anything else a .npz archive."""
+        if str(path).endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_binary(path)
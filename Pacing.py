@@ -0,0 +1,97 @@
+"""Adaptive frame pacing: full rate while the player interacts, throttled or blocking otherwise."""
+import time
+import pygame
+from Constants import PacingConstants
+
+
+class FramePacer:
+    """Decides how long the main loop sleeps and whether the next frame needs redrawing.
+
+    Three modes:
+      - active: input in the last ACTIVE_GRACE seconds or the camera is panning; tick at max_fps
+      - idle: playing with nothing to interact with; wait for input up to 1/idle_fps
+      - background: paused, minimized or unfocused; block on input up to background_wait_ms
+    Waiting goes through pygame.event.wait, so any input wakes the loop immediately. The
+    event that woke it is held until take_events() rather than re-posted, which would move
+    it behind anything queued after it.
+    """
+
+    def __init__(self, clock, profile="default", fps_cap=None):
+        self.clock = clock
+        self.set_profile(profile, fps_cap)
+        self.last_input_time = time.perf_counter()
+        self.had_input = True  # Always draw the first frame
+        self._woken_by = None
+
+    def set_profile(self, profile, fps_cap=None):
+        max_fps, idle_fps, background_wait_ms = PacingConstants.PROFILES[profile]
+        self.profile = profile
+        self.max_fps = min(max_fps, fps_cap) if fps_cap else max_fps
+        self.idle_fps = min(idle_fps, self.max_fps)
+        self.background_wait_ms = background_wait_ms
+
+    def note_input(self):
+        """Record that the player just did something; keeps the loop at full rate for a moment."""
+        self.last_input_time = time.perf_counter()
+        self.had_input = True
+
+    def is_active(self, panning=False):
+        return panning or time.perf_counter() - self.last_input_time < PacingConstants.ACTIVE_GRACE
+
+    def wait(self, background=False, panning=False):
+        """Sleep until the next frame is due and return the elapsed time in seconds."""
+        self.had_input = False
+        if not background and self.is_active(panning):
+            return self.clock.tick(self.max_fps) / 1000.0
+
+        timeout_ms = self.background_wait_ms if background else int(1000 / self.idle_fps)
+        event = pygame.event.wait(timeout_ms)
+        if event.type != pygame.NOEVENT:
+            self._woken_by = event
+        # Measure only; the wait above already did the sleeping
+        return self.clock.tick() / 1000.0
+
+    def take_events(self):
+        """All pending input in order: the event wait() removed from the queue, then the queue."""
+        events = pygame.event.get()
+        if self._woken_by is not None:
+            events.insert(0, self._woken_by)
+            self._woken_by = None
+        return events
+
+    def should_redraw(self, paused):
+        """Paused frames are static, so redraw them only in response to input."""
+        return self.had_input or not paused
+
+
+class RenderScaleController:
+    """Adjusts the world layer's render scale to keep frame work time near a target.
+
+    Work time (update + draw, excluding the pacer's sleep) is smoothed with an exponential
+    moving average. The scale moves one RENDER_SCALE_STEP at a time, and not again for
+    RENDER_SCALE_COOLDOWN frames, so it settles instead of oscillating and the world layer
+    is only reallocated occasionally.
+    """
+
+    def __init__(self, target_ms, scale=1.0, min_scale=PacingConstants.MIN_RENDER_SCALE):
+        self.target_ms = target_ms
+        self.scale = scale
+        self.min_scale = min_scale
+        self.average_ms = target_ms
+        self._cooldown = 0
+
+    def update(self, work_ms):
+        """Feed one frame's work time; returns the render scale for the next frame."""
+        self.average_ms += (work_ms - self.average_ms) * PacingConstants.RENDER_SCALE_SMOOTHING
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return self.scale
+        step = PacingConstants.RENDER_SCALE_STEP
+        if self.average_ms > self.target_ms and self.scale > self.min_scale:
+            self.scale = max(self.min_scale, self.scale - step)
+        elif self.average_ms < self.target_ms * PacingConstants.RENDER_SCALE_HEADROOM and self.scale < 1.0:
+            self.scale = min(1.0, self.scale + step)
+        else:
+            return self.scale
+        self._cooldown = PacingConstants.RENDER_SCALE_COOLDOWN
+        return self.scale
@@ -0,0 +1,145 @@
+"""Pooled particle effects for egg laying and egg sales."""
+from collections import deque
+import numpy as np
+import pygame
+from Constants import Color, ParticleConstants
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool updated with vectorized NumPy steps and drawn with one Surface.blits call.
+
+    Every particle lives in preallocated per-component arrays (x, y, vx, vy, life, max_life,
+    kind); a stack of free slot indices makes spawning and expiring O(1) per particle with no
+    allocation. Sprites are built once per kind at FADE_LEVELS alpha steps, so fading out is a
+    lookup rather than a per-frame set_alpha.
+
+    emit() only queues a request and is safe to call from the simulation thread; requests are
+    spawned on the next update() on the render thread. When the pool runs low or a frame's
+    spawn budget is used up, requests are thinned evenly across their origins instead of
+    starving later emitters, and the shortfall is counted in self.dropped. The request queue
+    is bounded too, so a headless farm that never calls update() doesn't accumulate them:
+    past max_requests the oldest request is discarded and counted as dropped.
+    """
+    EGG = 0
+    COIN = 1
+    # kind -> (colour, radius in px, lifetime s, launch speed, gravity)
+    KINDS = {
+        EGG: (Color.WHITE, 3, ParticleConstants.EGG_LIFETIME, ParticleConstants.EGG_SPEED, ParticleConstants.GRAVITY),
+        COIN: (Color.YELLOW, 4, ParticleConstants.COIN_LIFETIME, ParticleConstants.COIN_SPEED, 0.0),
+    }
+
+    def __init__(self, capacity=ParticleConstants.CAPACITY, seed=None,
+                 max_requests=ParticleConstants.MAX_QUEUED_REQUESTS):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        for name in ("x", "y", "vx", "vy", "gravity", "life", "max_life"):
+            setattr(self, name, np.zeros(capacity))
+        self.kind = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int64)
+        self._free_top = capacity  # self._free[:_free_top] are free slots
+        # (kind, (N, 2) origins, per_origin); deque appends are thread-safe
+        self._requests = deque(maxlen=max_requests)
+        self._sprites = None
+        self.spawned = 0
+        self.dropped = 0
+
+    @property
+    def active_count(self):
+        return self.capacity - self._free_top
+
+    def emit(self, kind, origins, per_origin=1):
+        """Queue per_origin particles of kind at each world point in origins (a point or (N, 2) array)."""
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        if len(origins):
+            requests = self._requests
+            if len(requests) == requests.maxlen:
+                # append() below discards the oldest; update() may pop it first, so this is approximate
+                _, evicted, evicted_per_origin = requests[0]
+                self.dropped += len(evicted) * evicted_per_origin
+            requests.append((kind, origins, per_origin))
+
+    def _spawn(self, kind, origins, per_origin, budget):
+        wanted = len(origins) * per_origin
+        count = min(wanted, budget, self._free_top)
+        self.dropped += wanted - count
+        if count <= 0:
+            return 0
+        # Thin evenly so every part of the farm still gets some effect
+        picks = np.repeat(origins, per_origin, axis=0)
+        if count < wanted:
+            picks = picks[np.linspace(0, wanted - 1, count).astype(np.int64)]
+
+        slots = self._free[self._free_top - count:self._free_top]
+        self._free_top -= count
+        _, _, lifetime, speed, gravity = self.KINDS[kind]
+        angles = self.rng.uniform(-0.5 * np.pi - 0.6, -0.5 * np.pi + 0.6, count)  # Upward cone
+        speeds = speed * self.rng.uniform(0.6, 1.0, count)
+        self.x[slots] = picks[:, 0]
+        self.y[slots] = picks[:, 1]
+        self.vx[slots] = np.cos(angles) * speeds
+        self.vy[slots] = np.sin(angles) * speeds
+        self.gravity[slots] = gravity
+        self.life[slots] = self.max_life[slots] = lifetime
+        self.kind[slots] = kind
+        self.alive[slots] = True
+        self.spawned += count
+        return count
+
+    def update(self, dt):
+        """Spawn queued requests within this frame's budget, then advance and expire particles."""
+        budget = ParticleConstants.MAX_SPAWN_PER_FRAME
+        while self._requests:
+            budget -= self._spawn(*self._requests.popleft(), budget)
+
+        if self._free_top == self.capacity:
+            return
+        alive = self.alive
+        step = alive * dt
+        self.vy += self.gravity * step
+        self.x += self.vx * step
+        self.y += self.vy * step
+        self.life -= step
+
+        expired = np.flatnonzero(alive & (self.life <= 0.0))
+        if expired.size:
+            alive[expired] = False
+            self._free[self._free_top:self._free_top + expired.size] = expired
+            self._free_top += expired.size
+
+    def _build_sprites(self):
+        levels = ParticleConstants.FADE_LEVELS
+        self._sprites = []
+        for kind in sorted(self.KINDS):
+            colour, radius, *_ = self.KINDS[kind]
+            frames = []
+            for level in range(levels):
+                # Alpha baked into the pixels: blits then needs no per-surface alpha state
+                alpha = int(255 * (level + 1) / levels)
+                frame = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(frame, colour + (alpha,), (radius, radius), radius)
+                pygame.draw.circle(frame, Color.BLACK + (alpha,), (radius, radius), radius, 1)
+                frames.append(frame)
+            self._sprites.append(frames)
+        self._radii = np.array([self.KINDS[kind][1] for kind in sorted(self.KINDS)])
+
+    def draw(self, screen, camera):
+        """Blit every live particle in one batched call. Returns the number drawn."""
+        if self._free_top == self.capacity:
+            return 0
+        if self._sprites is None:
+            self._build_sprites()
+        live = np.flatnonzero(self.alive)
+        world = np.empty((live.size, 2))
+        world[:, 0] = self.x[live]
+        world[:, 1] = self.y[live]
+        kinds = self.kind[live]
+        points = camera.world_to_screen_many(world) - self._radii[kinds][:, None]  # Centre sprites
+        levels = ParticleConstants.FADE_LEVELS
+        fade = np.minimum((self.life[live] / self.max_life[live] * levels).astype(np.int64), levels - 1)
+        sprites = self._sprites
+        screen.blits(
+            [(sprites[k][f], (px, py)) for k, f, (px, py) in zip(kinds.tolist(), fade.tolist(), points.tolist())],
+            doreturn=False,
+        )
+        return live.size
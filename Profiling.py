@@ -0,0 +1,281 @@
+"""Lightweight instrumentation helpers."""
+from collections import defaultdict, deque
+from contextlib import contextmanager
+import functools
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+
+class StartupTrace:
+    """Records how long each startup stage takes, up to the first presented frame.
+
+    Enabled by setting the EGGONOMICS_TRACE_STARTUP environment variable. The report flags
+    a first frame over budget: DEFAULT_BUDGET_MS, or EGGONOMICS_STARTUP_BUDGET_MS if set.
+    main.py --startup-check exits non-zero when it is exceeded.
+    """
+    ENV_VAR = "EGGONOMICS_TRACE_STARTUP"
+    BUDGET_ENV_VAR = "EGGONOMICS_STARTUP_BUDGET_MS"
+    DEFAULT_BUDGET_MS = 1000.0  # Process start (imports included) to first presented frame
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = bool(os.environ.get(self.ENV_VAR))
+        self.enabled = enabled
+        self.start_time = time.perf_counter()
+        self.stages = []  # (name, seconds)
+        self.first_frame_time = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one named stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - started))
+
+    def record(self, name, since):
+        """Record a stage that started at perf_counter() value `since` and ends now."""
+        self.stages.append((name, time.perf_counter() - since))
+
+    def first_frame(self):
+        """Mark the first presented frame. Returns total startup seconds; reports once if enabled."""
+        if self.first_frame_time is not None:
+            return self.first_frame_time
+        self.first_frame_time = time.perf_counter() - self.start_time
+        if self.enabled:
+            self.report()
+        return self.first_frame_time
+
+    def budget_ms(self):
+        budget_ms = os.environ.get(self.BUDGET_ENV_VAR)
+        return float(budget_ms) if budget_ms else self.DEFAULT_BUDGET_MS
+
+    def over_budget(self):
+        if self.first_frame_time is None:
+            return False
+        return self.first_frame_time * 1000.0 > self.budget_ms()
+
+    def report(self, stream=None):
+        stream = stream or sys.stderr
+        print("Startup trace:", file=stream)
+        for name, seconds in self.stages:
+            print(f"  {name:<28} {seconds * 1000.0:8.1f} ms", file=stream)
+        if self.first_frame_time is not None:
+            print(f"  {'first frame (total)':<28} {self.first_frame_time * 1000.0:8.1f} ms", file=stream)
+            if self.over_budget():
+                print(f"  over budget of {self.budget_ms():.0f} ms", file=stream)
+
+
+# Shared trace; its clock starts when this module is first imported
+STARTUP_TRACE = StartupTrace()
+
+
+def _subsystem(frame):
+    """Name the subsystem that owns a stack frame: its module's file name without .py."""
+    return os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+
+
+class MemoryMonitor:
+    """Attributes memory use, Surface churn and gc pauses to subsystems while the game runs.
+
+    Enabled by the EGGONOMICS_TRACE_MEMORY environment variable (or --memory-trace). When
+    started it:
+      - wraps pygame.Surface, pygame.font.Font (construction and render) and the allocating
+        pygame.transform functions to count new surfaces per subsystem per frame; the
+        subsystem is the module that made the call (Lighting, Ui, Entities, ...)
+      - takes a tracemalloc snapshot every SNAPSHOT_INTERVAL seconds and sums the retained
+        size by source module
+      - times every gc collection through gc.callbacks
+    A summary is logged to stderr every LOG_INTERVAL seconds and can be drawn as an overlay
+    (F3). A subsystem is flagged as a possible leak when its retained size never shrank
+    across the last EGGONOMICS_MEMORY_LEAK_MINUTES (default 5) minutes of snapshots and
+    grew by at least LEAK_MIN_BYTES overall.
+    """
+    ENV_VAR = "EGGONOMICS_TRACE_MEMORY"
+    LEAK_MINUTES_ENV_VAR = "EGGONOMICS_MEMORY_LEAK_MINUTES"
+    SNAPSHOT_INTERVAL = 10.0  # Seconds
+    LOG_INTERVAL = 30.0  # Seconds
+    LEAK_MIN_BYTES = 256 * 1024
+    TOP_SUBSYSTEMS = 6  # Rows shown per table in the log and overlay
+    # Live objects counted by type name at each snapshot
+    COUNTED_TYPES = ("Chicken", "Coop", "Land", "SimulationSnapshot")
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = bool(os.environ.get(self.ENV_VAR))
+        self.enabled = enabled
+        self.started = False
+        self.overlay_visible = False
+        self.leak_window = float(os.environ.get(self.LEAK_MINUTES_ENV_VAR, 5)) * 60.0
+        self.frames = 0
+        self._frame_surfaces = defaultdict(int)  # Subsystem -> surfaces allocated this frame
+        self.surfaces_per_frame = {}  # Subsystem -> mean over the last log interval
+        self._interval_surfaces = defaultdict(int)
+        self._interval_frames = 0
+        # gc pauses over the current log interval
+        self._gc_started = None
+        self.gc_collections = 0
+        self.gc_total_ms = 0.0
+        self.gc_max_ms = 0.0
+        self.retained = {}  # Subsystem -> bytes at the last snapshot
+        self.object_counts = {}
+        self._history = deque()  # (time, retained dict)
+        self.leaks = {}  # Subsystem -> bytes grown over the leak window
+        self._last_snapshot = 0.0
+        self._last_log = 0.0
+
+    def start(self):
+        """Install the hooks. Call once, after pygame.init() and before the Game is built."""
+        if self.started:
+            return
+        self.started = True
+        tracemalloc.start()
+        gc.callbacks.append(self._on_gc)
+        self._install_pygame_hooks()
+        self._last_snapshot = self._last_log = time.perf_counter()
+
+    def _count(self, depth=2):
+        self._frame_surfaces[_subsystem(sys._getframe(depth))] += 1
+
+    def _install_pygame_hooks(self):
+        import pygame
+        monitor = self
+
+        class CountedSurface(pygame.Surface):
+            def __init__(self, *args, **kwargs):
+                monitor._count()
+                super().__init__(*args, **kwargs)
+
+        class CountedFont(pygame.font.Font):
+            def __init__(self, *args, **kwargs):
+                monitor._count()
+                super().__init__(*args, **kwargs)
+
+            def render(self, *args, **kwargs):
+                monitor._count()
+                return super().render(*args, **kwargs)
+
+        pygame.Surface = CountedSurface
+        pygame.font.Font = CountedFont
+        for name in ("scale", "smoothscale", "rotate", "rotozoom", "flip"):
+            original = getattr(pygame.transform, name, None)
+            if original is not None:
+                setattr(pygame.transform, name, self._wrap_transform(original))
+
+    def _wrap_transform(self, original):
+        @functools.wraps(original)
+        def wrapper(surface, *args, **kwargs):
+            # scale/smoothscale write into dest_surface when given, so allocate nothing
+            if "dest_surface" not in kwargs and not (original.__name__.endswith("scale") and len(args) > 1):
+                self._count()
+            return original(surface, *args, **kwargs)
+        return wrapper
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            pause_ms = (time.perf_counter() - self._gc_started) * 1000.0
+            self._gc_started = None
+            self.gc_collections += 1
+            self.gc_total_ms += pause_ms
+            self.gc_max_ms = max(self.gc_max_ms, pause_ms)
+
+    def frame(self):
+        """Close the current frame's counters; snapshot and log when due. Call once per presented frame."""
+        if not self.started:
+            return
+        self.frames += 1
+        self._interval_frames += 1
+        for subsystem, count in self._frame_surfaces.items():
+            self._interval_surfaces[subsystem] += count
+        self._frame_surfaces.clear()
+
+        now = time.perf_counter()
+        if now - self._last_snapshot >= self.SNAPSHOT_INTERVAL:
+            self._last_snapshot = now
+            self.snapshot(now)
+        if now - self._last_log >= self.LOG_INTERVAL:
+            self._last_log = now
+            self.surfaces_per_frame = {k: v / self._interval_frames for k, v in self._interval_surfaces.items()}
+            self.report()
+            self._interval_surfaces.clear()
+            self._interval_frames = 0
+            self.gc_collections = 0
+            self.gc_total_ms = 0.0
+            self.gc_max_ms = 0.0
+
+    def snapshot(self, now=None):
+        """Record retained bytes per subsystem and live object counts, then re-run the leak check."""
+        now = time.perf_counter() if now is None else now
+        retained = defaultdict(int)
+        for stat in tracemalloc.take_snapshot().statistics("filename"):
+            frame = stat.traceback[0]
+            retained[os.path.splitext(os.path.basename(frame.filename))[0]] += stat.size
+        self.retained = dict(retained)
+
+        counts = dict.fromkeys(self.COUNTED_TYPES, 0)
+        for obj in gc.get_objects():
+            name = type(obj).__name__
+            if name in counts:
+                counts[name] += 1
+        self.object_counts = counts
+
+        self._history.append((now, self.retained))
+        while self._history and now - self._history[0][0] > self.leak_window:
+            self._history.popleft()
+        self.leaks = self._find_leaks()
+
+    def _find_leaks(self):
+        # Only judge once the history spans the whole window (to within one snapshot)
+        if len(self._history) < 3 or self._history[-1][0] - self._history[0][0] < self.leak_window - self.SNAPSHOT_INTERVAL:
+            return {}
+        leaks = {}
+        for subsystem in self._history[-1][1]:
+            sizes = [retained.get(subsystem, 0) for _, retained in self._history]
+            growth = sizes[-1] - sizes[0]
+            if growth >= self.LEAK_MIN_BYTES and all(b >= a for a, b in zip(sizes, sizes[1:])):
+                leaks[subsystem] = growth
+        return leaks
+
+    def summary_lines(self):
+        current, peak = tracemalloc.get_traced_memory() if self.started else (0, 0)
+        lines = [
+            f"traced {current / 2**20:.1f} MB (peak {peak / 2**20:.1f} MB), {self.frames} frames",
+            f"gc: {self.gc_collections} collections, {self.gc_total_ms:.1f} ms total, {self.gc_max_ms:.2f} ms max pause",
+        ]
+        top = sorted(self.surfaces_per_frame.items(), key=lambda item: -item[1])[:self.TOP_SUBSYSTEMS]
+        if top:
+            lines.append("surfaces/frame: " + ", ".join(f"{name} {count:.1f}" for name, count in top))
+        top = sorted(self.retained.items(), key=lambda item: -item[1])[:self.TOP_SUBSYSTEMS]
+        if top:
+            lines.append("retained: " + ", ".join(f"{name} {size / 1024:.0f} KB" for name, size in top))
+        if self.object_counts:
+            lines.append("live: " + ", ".join(f"{name} {count}" for name, count in self.object_counts.items()))
+        for subsystem, growth in sorted(self.leaks.items(), key=lambda item: -item[1]):
+            lines.append(f"possible leak: {subsystem} grew {growth / 1024:.0f} KB over {self.leak_window / 60:.3g} min")
+        return lines
+
+    def report(self, stream=None):
+        stream = stream or sys.stderr
+        print("Memory:", file=stream)
+        for line in self.summary_lines():
+            print(f"  {line}", file=stream)
+
+    def draw_overlay(self, screen, font):
+        """Draw summary_lines() in the bottom-left corner above the instructions."""
+        lines = self.summary_lines()
+        y = screen.get_height() - 110 - len(lines) * 18
+        for line in lines:
+            colour = (255, 80, 80) if line.startswith("possible leak") else (255, 255, 255)
+            text = font.render(line, True, colour, (0, 0, 0))
+            screen.blit(text, (10, y))
+            y += 18
+
+
+# Shared monitor; inactive until start() is called
+MEMORY_MONITOR = MemoryMonitor()
@@ -0,0 +1,136 @@
+"""Coop and chicken type records, loaded and validated once from breeds.json."""
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Tuple
+from Constants import GameConstants
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "breeds.json")
+
+
+@dataclass(frozen=True)
+class ChickenBreed:
+    """A chicken breed. Rates are per chicken; feed_per_second is derived from feed_rate."""
+    __slots__ = ("key", "name", "cost", "production_rate", "feed_rate", "feed_per_second")
+    key: str
+    name: str
+    cost: int
+    production_rate: float  # Eggs per second
+    feed_rate: float  # Feed % per minute
+    feed_per_second: float
+
+
+@dataclass(frozen=True)
+class CoopType:
+    """A coop type with its breed resolved and per-frame values precomputed.
+
+    blight_hazard is the blight chance per chicken-second, footprint the (row, col) offsets
+    of the tiles the coop covers, anchor_offset_x the world x shift from the owner tile to
+    the coop's centre, and render_size its drawn width in world pixels at zoom 1.
+    """
+    __slots__ = ("key", "name", "cost", "capacity", "blight_multiplier", "land_slots", "render_scale", "breed",
+                 "blight_hazard", "footprint", "anchor_offset_x", "render_size")
+    key: str
+    name: str
+    cost: int
+    capacity: int
+    blight_multiplier: float
+    land_slots: int
+    render_scale: float
+    breed: ChickenBreed
+    blight_hazard: float
+    footprint: Tuple[Tuple[int, int], ...]
+    anchor_offset_x: float
+    render_size: float
+
+
+def _object(source, value):
+    """value if it is a JSON object, else a ValueError naming source."""
+    if not isinstance(value, dict):
+        raise ValueError(f"{source} must be an object, got {value!r}")
+    return value
+
+
+def _field(source, record, name, kind, minimum):
+    value = record.get(name)
+    # bool is an int subclass but never a valid count or rate
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise ValueError(f"{source}: '{name}' must be {kind.__name__ if isinstance(kind, type) else 'a number'}, got {value!r}")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{source}: '{name}' must be at least {minimum}, got {value!r}")
+    return value
+
+
+_NUMBER = (int, float)
+
+
+def _chicken_breed(key, record, source):
+    source = f"{source}: chicken '{key}'"
+    record = _object(source, record)
+    feed_rate = float(_field(source, record, "feed_rate", _NUMBER, 0))
+    return ChickenBreed(
+        key=key,
+        name=_field(source, record, "name", str, None),
+        cost=_field(source, record, "cost", int, 0),
+        production_rate=float(_field(source, record, "production_rate", _NUMBER, 0)),
+        feed_rate=feed_rate,
+        feed_per_second=feed_rate / 60.0,
+    )
+
+
+def _coop_type(key, record, chickens, source):
+    source = f"{source}: coop '{key}'"
+    record = _object(source, record)
+    breed_key = _field(source, record, "breed", str, None)
+    if breed_key not in chickens:
+        raise ValueError(f"{source}: unknown breed {breed_key!r}")
+    land_slots = _field(source, record, "land_slots", int, 1)
+    blight_multiplier = float(_field(source, record, "blight_multiplier", _NUMBER, 0))
+    render_scale = float(_field(source, record, "render_scale", _NUMBER, 0))
+    return CoopType(
+        key=key,
+        name=_field(source, record, "name", str, None),
+        cost=_field(source, record, "cost", int, 0),
+        capacity=_field(source, record, "capacity", int, 1),
+        blight_multiplier=blight_multiplier,
+        land_slots=land_slots,
+        render_scale=render_scale,
+        breed=chickens[breed_key],
+        blight_hazard=GameConstants.BLIGHT_CHANCE * blight_multiplier,
+        # Multi-slot coops extend along the row (col + 1, ...)
+        footprint=tuple((0, i) for i in range(land_slots)),
+        anchor_offset_x=GameConstants.LAND_SIZE / 2 * (land_slots - 1),
+        render_size=GameConstants.COOP_SIZE * render_scale,
+    )
+
+
+class TypeRegistry:
+    """Every coop type and chicken breed, keyed as in the data file (file order is kept)."""
+
+    def __init__(self, coops: Dict[str, CoopType], chickens: Dict[str, ChickenBreed]):
+        if not coops:
+            raise ValueError("at least one coop type is required")
+        self.coops = coops
+        self.chickens = chickens
+        # The first coop listed is placed when no type is given
+        self.default_coop = next(iter(coops.values()))
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """Read and validate a registry file. Raises ValueError on a malformed entry."""
+        with open(path) as f:
+            data = json.load(f)
+        source = os.path.basename(path)
+        data = _object(source, data)
+        chicken_records = _object(f"{source}: 'chickens'", data.get("chickens", {}))
+        coop_records = _object(f"{source}: 'coops'", data.get("coops", {}))
+        chickens = {key: _chicken_breed(key, record, source) for key, record in chicken_records.items()}
+        coops = {key: _coop_type(key, record, chickens, source) for key, record in coop_records.items()}
+        return cls(coops, chickens)
+
+    def coop(self, key):
+        """Coop type for key, or None if there is no such type."""
+        return self.coops.get(key)
+
+
+REGISTRY = TypeRegistry.load()
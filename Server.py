@@ -0,0 +1,357 @@
+"""Local simulation server: drive a farm with JSON commands and stream delta-encoded state.
+
+Protocol: newline-delimited JSON over TCP (localhost) or a Unix socket.
+
+  request:   {"id": 1, "cmd": "buy_chicken", "row": 0, "col": 0}
+  batch:     [{"id": 1, "cmd": ...}, {"id": 2, "cmd": ...}]   -> one JSON list of replies
+  reply:     {"id": 1, "ok": true}  or  {"id": 1, "ok": false, "error": "..."}
+             ok is true only if the command changed the farm; replies are sent once it has run
+  subscribe: {"cmd": "subscribe"}  -> a "keyframe" message, then "delta" messages
+
+Deltas carry only the globals and per-land fields that changed since the previous message.
+
+Run standalone with a headless farm:  python Server.py [--port N | --unix PATH]
+Measure command throughput:           python Server.py --bench
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from Registry import REGISTRY
+
+
+LAND_FIELDS = ("coop", "occupied", "chickens", "feed", "blight", "eggs")
+
+
+def _land_key(land):
+    return f"{land.row},{land.col}"
+
+
+def _land_state(land):
+    coop = land.coop or land.coop_occupying_land
+    if coop is None:
+        return (None, False, 0, 0.0, False, 0.0)
+    return (
+        coop.coop_type.name,
+        land.coop is None,
+        len(coop.chickens),
+        round(coop.feed_level, 1),  # Quantized so slow feed burn doesn't resend every tick
+        coop.blight_active,
+        coop.eggs_produced,
+    )
+
+
+def _global_state(view):
+    return {
+        "money": round(view.money, 2),
+        "eggs": view.total_eggs,
+        "capacity": view.egg_capacity,
+        "time": round(view.game_time, 1),
+    }
+
+
+class DeltaEncoder:
+    """Tracks the last state sent to subscribers and encodes what changed since."""
+
+    def __init__(self):
+        self.globals = {}
+        self.lands = {}  # "row,col" -> tuple in LAND_FIELDS order
+
+    def encode(self, view, tick):
+        """Return a delta message for view, or None if nothing changed."""
+        changed_globals = {}
+        for name, value in _global_state(view).items():
+            if self.globals.get(name) != value:
+                changed_globals[name] = value
+                self.globals[name] = value
+
+        changed_lands = {}
+        for land in view.lands:
+            key = _land_key(land)
+            state = _land_state(land)
+            previous = self.lands.get(key)
+            if previous == state:
+                continue
+            if previous is None:
+                changed_lands[key] = dict(zip(LAND_FIELDS, state))
+            else:
+                changed_lands[key] = {f: v for f, v, old in zip(LAND_FIELDS, state, previous) if v != old}
+            self.lands[key] = state
+
+        if not changed_globals and not changed_lands:
+            return None
+        return {"type": "delta", "tick": tick, "globals": changed_globals, "lands": changed_lands}
+
+    def keyframe(self, tick):
+        """Full copy of the last encoded state, for subscribers joining mid-stream."""
+        return {
+            "type": "keyframe",
+            "tick": tick,
+            "globals": dict(self.globals),
+            "lands": {key: dict(zip(LAND_FIELDS, state)) for key, state in self.lands.items()},
+        }
+
+
+def _land_from(game, request):
+    land = game.land_grid.get((request.get("row"), request.get("col")))
+    if land is None:
+        raise ValueError("no land at row/col")
+    return land
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_request(game, request):
+    """Return an error message if request is malformed, else None. Checked before anything runs."""
+    if not isinstance(request, dict):
+        return "request must be a JSON object"
+    name = request.get("cmd")
+    if not isinstance(name, str):
+        return "'cmd' must be a string"
+    if name not in COMMANDS:
+        return f"unknown command {name!r}"
+    if name in LAND_COMMANDS:
+        if not (_is_int(request.get("row")) and _is_int(request.get("col"))):
+            return "'row' and 'col' must be integers"
+        if (request["row"], request["col"]) not in game.land_grid:
+            return "no land at row/col"
+    if name == "buy_coop" and "type" in request:
+        coop_type = request["type"]
+        if not isinstance(coop_type, str) or coop_type not in REGISTRY.coops:
+            return f"unknown coop type {coop_type!r}"
+    return None
+
+
+# Command name -> (game, request) -> bool (True if the farm changed). Mirrors the sidebar buttons.
+COMMANDS = {
+    "buy_land": lambda game, r: game.buy_land(),
+    "buy_coop": lambda game, r: game.buy_coop(r.get("type", REGISTRY.default_coop.key), _land_from(game, r)),
+    "buy_chicken": lambda game, r: game.buy_chicken(_land_from(game, r)),
+    "buy_feed": lambda game, r: game.buy_feed(_land_from(game, r)),
+    "sell_eggs": lambda game, r: game.sell_eggs(),
+    "buy_blight_cure": lambda game, r: game.buy_blight_cure(),
+    "cull_blighted_chickens": lambda game, r: game.cull_blighted_chickens(),
+    "upgrade_egg_capacity": lambda game, r: game.upgrade_egg_capacity(),
+}
+LAND_COMMANDS = {"buy_coop", "buy_chicken", "buy_feed"}
+
+
+class SimulationServer:
+    """Serves one Game to local clients.
+
+    In standalone mode (drive_simulation=True) the server owns the game and steps it from
+    its own event loop, so commands apply immediately. When attached to a running Game in
+    threaded mode, commands are queued through Game.dispatch and state is read from the
+    simulation thread's published snapshots.
+    """
+
+    def __init__(self, game, drive_simulation=True, stream_every=6):
+        self.game = game
+        self.drive_simulation = drive_simulation
+        self.stream_every = stream_every  # Ticks between state messages
+        self.encoder = DeltaEncoder()
+        self.subscribers = set()
+        self.tick = 0
+        self.commands_handled = 0
+        self._server = None
+        self._client_tasks = set()
+
+    def _view(self):
+        if self.game.simulation is not None:
+            return self.game.simulation.latest()
+        return self.game
+
+    def handle_request(self, request):
+        """Validate and run one request.
+
+        Returns:
+            The reply dict. When attached to a threaded Game the command is queued instead and a
+            Future of the reply is returned; it resolves once the simulation thread has run it.
+        """
+        reply = {"id": request.get("id") if isinstance(request, dict) else None}
+        error = validate_request(self.game, request)
+        if error is not None:
+            reply.update(ok=False, error=error)
+            return reply
+        command = COMMANDS[request["cmd"]]
+        try:
+            outcome = self.game.dispatch(command, self.game, request)
+        except Exception as e:
+            traceback.print_exc()
+            return self._finish(reply, error=e)
+        if isinstance(outcome, Future):
+            # Queued for the simulation thread; reply once it has run
+            pending = Future()
+            outcome.add_done_callback(lambda queued: pending.set_result(
+                self._finish(reply, error=queued.exception()) if queued.exception() is not None
+                else self._finish(reply, queued.result())))
+            return pending
+        return self._finish(reply, outcome)
+
+    def _finish(self, reply, applied=False, error=None):
+        """Fill in reply from a command's outcome."""
+        if error is not None:
+            reply.update(ok=False, error=str(error))
+        elif applied:
+            self.commands_handled += 1
+            reply["ok"] = True
+        else:
+            reply.update(ok=False, error="not applied (not enough money, or nothing to act on)")
+        return reply
+
+    async def handle_requests(self, requests):
+        """Run a batch in order and return its replies; queued commands are awaited together."""
+        replies = [self.handle_request(r) for r in requests]
+        return [await asyncio.wrap_future(r) if isinstance(r, Future) else r for r in replies]
+
+    async def _handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    self._send(writer, {"ok": False, "error": "invalid JSON"})
+                    continue
+                if isinstance(message, list):
+                    self._send(writer, await self.handle_requests(message))
+                elif isinstance(message, dict) and message.get("cmd") == "subscribe":
+                    # Flush pending changes to existing subscribers so the baseline is current
+                    self.broadcast()
+                    self._send(writer, self.encoder.keyframe(self.tick))
+                    self.subscribers.add(writer)
+                else:
+                    self._send(writer, (await self.handle_requests([message]))[0])
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Cancelled by stop(); finish quietly so the stream callback doesn't report it
+            pass
+        finally:
+            self._client_tasks.discard(task)
+            self.subscribers.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _send(writer, message):
+        writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+    def broadcast(self):
+        delta = self.encoder.encode(self._view(), self.tick)
+        if delta is None:
+            return
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.subscribers.discard(writer)
+            else:
+                self._send(writer, delta)
+
+    async def _tick_loop(self):
+        tick_dt = 1.0 / self.game.tick_rate
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(tick_dt)
+            now = time.perf_counter()
+            if self.drive_simulation and self.game.state == self.game.GameState.PLAYING:
+                self.game.advance_simulation(now - last)
+            last = now
+            self.tick += 1
+            if self.subscribers and self.tick % self.stream_every == 0:
+                self.broadcast()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._tick_task = asyncio.create_task(self._tick_loop())
+        return self._server
+
+    async def stop(self):
+        self._tick_task.cancel()
+        for task in list(self._client_tasks):
+            task.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def serve_forever(self, **kwargs):
+        await self.start(**kwargs)
+        async with self._server:
+            await self._server.serve_forever()
+
+
+def serve_in_background(game, host="127.0.0.1", port=8765, unix_path=None):
+    """Serve a running Game (which must use threaded simulation) from a daemon thread."""
+    server = SimulationServer(game, drive_simulation=False)
+    thread = threading.Thread(
+        target=lambda: asyncio.run(server.serve_forever(host=host, port=port, unix_path=unix_path)),
+        name="simulation-server",
+        daemon=True,
+    )
+    thread.start()
+    return server
+
+
+async def run_benchmark(game, commands=20000, batch_size=500):
+    """Loopback client: send batched commands to an in-process server and report throughput."""
+    server = SimulationServer(game)
+    await server.start(port=0)
+    port = server._server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    game.money = float("inf")  # Benchmark command handling, not the economy
+
+    started = time.perf_counter()
+    sent = 0
+    failures = 0
+    while sent < commands:
+        batch = []
+        for i in range(min(batch_size, commands - sent)):
+            land = game.lands[(sent + i) % len(game.lands)]
+            batch.append({"id": sent + i, "cmd": "buy_feed", "row": land.row, "col": land.col})
+        writer.write(json.dumps(batch).encode() + b"\n")
+        await writer.drain()
+        replies = json.loads(await reader.readline())
+        failures += sum(not r["ok"] for r in replies)
+        sent += len(batch)
+    elapsed = time.perf_counter() - started
+
+    writer.close()
+    await server.stop()
+    return sent / elapsed, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Eggonomics simulation server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", default=None, help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--bench", action="store_true", help="run the loopback throughput benchmark and exit")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from Game import Game
+    pygame.init()
+    game = Game()
+    if args.bench:
+        game.money = 1e12
+        for land in game.lands:
+            game.buy_coop(REGISTRY.default_coop.key, land)
+        rate, failures = asyncio.run(run_benchmark(game))
+        print(f"{rate:,.0f} commands/s ({failures} failed)")
+    else:
+        asyncio.run(SimulationServer(game).serve_forever(host=args.host, port=args.port, unix_path=args.unix))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
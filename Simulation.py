@@ -0,0 +1,228 @@
+"""Fixed-rate simulation thread that publishes immutable snapshots for the render loop."""
+from dataclasses import dataclass, field, replace
+from concurrent.futures import Future
+from typing import Dict, Tuple
+import queue
+import threading
+import time
+import traceback
+
+
+@dataclass(frozen=True)
+class SimulationSnapshot:
+    """Read-only copy of the simulation state at the end of one tick.
+
+    Attribute names mirror the Game fields that draw() reads, so the renderer can use either
+    a snapshot or the live Game object interchangeably.
+    """
+    tick: int
+    timestamp: float
+    game_time: float
+    money: float
+    total_eggs: float
+    egg_capacity: float
+    expanded_capacity_price: int
+    lands: Tuple = ()
+    # id(live land) -> copied land, used to map the UI selection onto the snapshot
+    land_views: Dict[int, object] = field(default_factory=dict)
+    # The live game's DrawOrder.entries(): (live land, is_structure) pairs in painter's order,
+    # shared between snapshots; the renderer maps each land through land_views
+    draw_order: Tuple = ()
+
+    @classmethod
+    def capture(cls, game, tick, cache=None):
+        """Copy the parts of the game state the renderer needs.
+
+        Lands and coops are shallow-copied and each coop gets its own chicken list, so the
+        simulation thread can keep mutating the live objects without affecting this snapshot.
+        Copies are never mutated after capture, so with a CaptureCache a coop whose version
+        is unchanged (and a land whose coops are unchanged) reuses the previous copy.
+        """
+        if cache is None:
+            cache = CaptureCache()
+        changed = len(game.lands) != len(cache.lands)
+        lands = []
+        for land in game.lands:
+            land_copy = cache.land_copy(land)
+            changed = changed or land_copy is not cache.lands[len(lands)]
+            lands.append(land_copy)
+        if changed:
+            cache.lands = tuple(lands)
+            cache.land_views = {id(land): land_copy for land, land_copy in zip(game.lands, lands)}
+        return cls(
+            tick=tick,
+            timestamp=time.perf_counter(),
+            game_time=game.game_time,
+            money=game.money,
+            total_eggs=game.total_eggs,
+            egg_capacity=game.egg_capacity,
+            expanded_capacity_price=game.expanded_capacity_price,
+            lands=cache.lands,
+            land_views=cache.land_views,
+            draw_order=game.draw_order.entries(),
+        )
+
+    def interpolate(self, previous, alpha):
+        """Return a snapshot whose continuous values are blended from previous towards self."""
+        if previous is None or alpha >= 1.0:
+            return self
+        alpha = max(0.0, alpha)
+        return replace(
+            self,
+            game_time=previous.game_time + (self.game_time - previous.game_time) * alpha,
+            total_eggs=previous.total_eggs + (self.total_eggs - previous.total_eggs) * alpha,
+        )
+
+
+def _clone(obj):
+    # Shallow copy without copy.copy's __reduce_ex__ round trip
+    clone = object.__new__(type(obj))
+    clone.__dict__.update(obj.__dict__)
+    return clone
+
+
+class CaptureCache:
+    """Copies made by earlier captures, keyed by the live object they were copied from."""
+
+    def __init__(self):
+        self.coops = {}  # id(coop) -> (coop, version copied, copy)
+        self.land_entries = {}  # id(land) -> (land, coop copy, occupying coop copy, land copy)
+        self.lands = ()
+        self.land_views = {}
+
+    def coop_copy(self, coop):
+        if coop is None:
+            return None
+        # Multi-slot coops are referenced from two lands; both get the one cached copy
+        entry = self.coops.get(id(coop))
+        if entry is not None and entry[0] is coop and entry[1] == coop.version:
+            return entry[2]
+        coop_copy = _clone(coop)
+        coop_copy.chickens = list(coop.chickens)
+        self.coops[id(coop)] = (coop, coop.version, coop_copy)
+        return coop_copy
+
+    def land_copy(self, land):
+        coop_copy = self.coop_copy(land.coop)
+        occupying_copy = self.coop_copy(land.coop_occupying_land)
+        entry = self.land_entries.get(id(land))
+        if entry is not None and entry[0] is land and entry[1] is coop_copy and entry[2] is occupying_copy:
+            return entry[3]
+        land_copy = _clone(land)
+        land_copy.coop = coop_copy
+        land_copy.coop_occupying_land = occupying_copy
+        self.land_entries[id(land)] = (land, coop_copy, occupying_copy, land_copy)
+        return land_copy
+
+
+class SimulationThread(threading.Thread):
+    """Runs Game.step_simulation on a worker thread at a fixed tick rate.
+
+    Player commands are queued from the render thread and applied between ticks, so every
+    state mutation happens on this thread. A command that raises is logged and reported
+    through its Future; it never stops the tick loop. After each tick a new SimulationSnapshot is
+    published; the renderer reads the latest pair and interpolates between them.
+    """
+    # Max ticks to run back-to-back when catching up after a stall
+    MAX_CATCH_UP_TICKS = 5
+    # While paused the thread sleeps on the command queue; this bounds how long stop() waits
+    PAUSED_POLL = 0.25
+
+    def __init__(self, game, tick_rate=60):
+        super().__init__(name="simulation", daemon=True)
+        self.game = game
+        self.tick_dt = 1.0 / tick_rate
+        self.tick = 0
+        self.commands = queue.SimpleQueue()
+        self._stop_event = threading.Event()
+        self._capture_cache = CaptureCache()
+        current = SimulationSnapshot.capture(game, 0, self._capture_cache)
+        # (previous, current) is replaced as a single tuple so readers never see a torn pair
+        self._snapshots = (current, current)
+
+    def submit(self, command, *args):
+        """Queue a callable to run on the simulation thread before the next tick.
+
+        Returns:
+            A concurrent.futures.Future resolved with the command's return value or exception
+        """
+        future = Future()
+        self.commands.put((command, args, future))
+        return future
+
+    def stop(self):
+        self._stop_event.set()
+        self.wake()
+
+    def wake(self):
+        """Interrupt a paused wait, e.g. after the game state changed."""
+        self.commands.put(None)
+
+    def latest(self):
+        """Return the most recently published snapshot."""
+        return self._snapshots[1]
+
+    def interpolated(self):
+        """Return the latest snapshot blended by how far wall time has progressed into the next tick."""
+        previous, current = self._snapshots
+        alpha = (time.perf_counter() - current.timestamp) / self.tick_dt
+        return current.interpolate(previous, alpha)
+
+    def _drain_commands(self, timeout=None):
+        """Run every queued command. Returns how many ran.
+
+        Args:
+            timeout: If given, first block up to this many seconds for an item to arrive
+        """
+        ran = 0
+        while True:
+            try:
+                if timeout is not None:
+                    item = self.commands.get(timeout=timeout)
+                    timeout = None
+                else:
+                    item = self.commands.get_nowait()
+            except queue.Empty:
+                return ran
+            if item is None:  # wake() sentinel
+                continue
+            command, args, future = item
+            ran += 1
+            try:
+                result = command(*args)
+            except Exception as e:
+                traceback.print_exc()
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def _publish(self):
+        self._snapshots = (self._snapshots[1], SimulationSnapshot.capture(self.game, self.tick, self._capture_cache))
+
+    def run(self):
+        next_tick = time.perf_counter()
+        while not self._stop_event.is_set():
+            if self.game.state != self.game.GameState.PLAYING:
+                # Nothing advances while paused: sleep until a command (or wake()) arrives
+                if self._drain_commands(timeout=self.PAUSED_POLL):
+                    self._publish()
+                next_tick = time.perf_counter()
+                continue
+            now = time.perf_counter()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+                continue
+
+            ticks = 0
+            while next_tick <= time.perf_counter() and ticks < self.MAX_CATCH_UP_TICKS:
+                self._drain_commands()
+                if self.game.state == self.game.GameState.PLAYING:
+                    self.game.step_simulation(self.tick_dt)
+                self.tick += 1
+                ticks += 1
+                next_tick += self.tick_dt
+            if next_tick <= time.perf_counter():
+                # Too far behind; drop the backlog instead of spiralling
+                next_tick = time.perf_counter() + self.tick_dt
+
+            self._publish()
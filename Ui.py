@@ -2,34 +2,162 @@ import pygame
 from Constants import Color
 
 
-class Button:
-    """UI Button class"""
-    def __init__(self, x, y, width, height, text, color, text_color):
+class Widget:
+    """Base for retained UI widgets: a rect plus visibility, hover and dirty state.
+
+    State only changes through the setters below, which set self.dirty when something
+    visible changed; Button.draw() re-renders its cached surface only while it is dirty.
+    A widget added to a UiTree reports its moves so the tree's spatial index stays current.
+    """
+
+    def __init__(self, x, y, width, height):
         self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
+        self.visible = True
+        self.hovered = False
+        self.dirty = True
+        self.on_click = None
+        self.tree = None
+
+    def set_visible(self, visible):
+        if visible != self.visible:
+            self.visible = visible
+            self.hovered = False
+            self.dirty = True
+
+    def set_hovered(self, hovered):
+        if hovered != self.hovered:
+            self.hovered = hovered
+            self.dirty = True
+
+    def move_to(self, x, y):
+        if self.rect.topleft != (x, y):
+            self.rect.topleft = (x, y)
+            self.dirty = True
+            if self.tree is not None:
+                self.tree.reindex(self)
+
+
+class Button(Widget):
+    """UI Button class"""
+    def __init__(self, x, y, width, height, text, color, text_color, on_click=None):
+        super().__init__(x, y, width, height)
+        self._text = text
         self.color = color
         self.text_color = text_color
-        self.hovered = False
+        self.on_click = on_click
+        self._surface = None
+        self._font = None
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        if text != self._text:
+            self._text = text
+            self.dirty = True
+
+    def _render(self, font):
+        surface = pygame.Surface(self.rect.size)
+        local = surface.get_rect()
+        surface.fill(Color.LIGHT_GRAY if self.hovered else self.color)
+        pygame.draw.rect(surface, Color.BLACK, local, 2)
+        text_surface = font.render(self._text, True, self.text_color)
+        surface.blit(text_surface, text_surface.get_rect(center=local.center))
+        self._surface = surface
+        self._font = font
+        self.dirty = False
 
     def draw(self, screen, font):
-        color = Color.LIGHT_GRAY if self.hovered else self.color
-        pygame.draw.rect(screen, color, self.rect)
-        pygame.draw.rect(screen, Color.BLACK, self.rect, 2)
+        if self.dirty or font is not self._font:
+            self._render(font)
+        screen.blit(self._surface, self.rect)
+
 
-        text_surface = font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+class UiTree:
+    """Retained set of clickable widgets, hit-tested through a uniform grid of screen cells.
 
-    def is_clicked(self, mouse_pos):
-        return self.rect.collidepoint(mouse_pos)
+    Each widget is bucketed into every CELL-sized cell its rect overlaps, so a lookup only
+    tests the few widgets in the cell under the pointer. Widgets added later sit on top.
+    Hover is resolved only when on_motion() is called (on MOUSEMOTION), and only the
+    widgets whose hover actually changed are marked dirty.
+    """
+    CELL = 64
 
-    def update_hover(self, mouse_pos):
-        self.hovered = self.rect.collidepoint(mouse_pos)
+    def __init__(self):
+        self.widgets = []
+        self.hovered = None
+        self._cells = {}  # (cx, cy) -> widgets overlapping that cell
+        self._widget_cells = {}  # id(widget) -> cells it is bucketed in
+        self._order = {}  # id(widget) -> z order
+
+    def add(self, widget, on_click=None):
+        """Index widget for hit-testing; on_click (if given) replaces its click handler."""
+        if on_click is not None:
+            widget.on_click = on_click
+        widget.tree = self
+        self._order[id(widget)] = len(self.widgets)
+        self.widgets.append(widget)
+        self.reindex(widget)
+        return widget
+
+    def _cells_for(self, rect):
+        cell = self.CELL
+        return [(cx, cy)
+                for cx in range(rect.left // cell, (rect.right - 1) // cell + 1)
+                for cy in range(rect.top // cell, (rect.bottom - 1) // cell + 1)]
+
+    def reindex(self, widget):
+        """Re-bucket a widget after its rect changed."""
+        for key in self._widget_cells.get(id(widget), ()):
+            self._cells[key].remove(widget)
+        cells = self._cells_for(widget.rect)
+        for key in cells:
+            self._cells.setdefault(key, []).append(widget)
+        self._widget_cells[id(widget)] = cells
+
+    def widget_at(self, pos):
+        """Topmost visible widget under pos, or None."""
+        bucket = self._cells.get((pos[0] // self.CELL, pos[1] // self.CELL))
+        if not bucket:
+            return None
+        hits = [w for w in bucket if w.visible and w.rect.collidepoint(pos)]
+        if not hits:
+            return None
+        return max(hits, key=lambda w: self._order[id(w)])
+
+    def on_motion(self, pos):
+        widget = self.widget_at(pos)
+        if widget is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.set_hovered(False)
+            if widget is not None:
+                widget.set_hovered(True)
+            self.hovered = widget
+
+    def on_click(self, pos):
+        """Run the click handler of the widget under pos. Returns that widget, or None if the click missed the UI."""
+        widget = self.widget_at(pos)
+        if widget is not None and widget.on_click is not None:
+            widget.on_click()
+        return widget
+
+
+def _metric_font():
+    # Shared across panels and built once; Font(None, ...) loads the default font from disk
+    global _METRIC_FONT
+    if _METRIC_FONT is None:
+        _METRIC_FONT = pygame.font.Font(None, 16)
+    return _METRIC_FONT
+
+
+_METRIC_FONT = None
 
 
 class CollapsiblePanel:
     """A retractable panel that shows coop metrics with expandable/collapsible button."""
-    
+
     def __init__(self, x, y, width, height, title):
         self.x = x
         self.y = y
@@ -37,16 +165,34 @@ class CollapsiblePanel:
         self.height = height
         self.title = title
         self.is_expanded = False
-        self.toggle_button = Button(x, y, width, 25, "▼ " + title, Color.GRAY, Color.WHITE)
-        
+        self.toggle_button = Button(x, y, width, 25, "▼ " + title, Color.GRAY, Color.WHITE, on_click=self.toggle)
+        self.panel_rect = self._panel_rect()
+
+    def _panel_rect(self):
+        return pygame.Rect(self.x, self.y + 25, self.width, self.height - 25)
+
+    def attach(self, tree):
+        """Register the panel's clickable widgets with a UiTree."""
+        tree.add(self.toggle_button)
+
+    def set_visible(self, visible):
+        self.toggle_button.set_visible(visible)
+
+    def move_to(self, x, y):
+        """Reposition the panel (used when the window layout changes)."""
+        self.x = x
+        self.y = y
+        self.toggle_button.move_to(x, y)
+        self.panel_rect = self._panel_rect()
+
     def toggle(self):
         """Toggle expanded/collapsed state."""
         self.is_expanded = not self.is_expanded
         self.toggle_button.text = ("▲ " if self.is_expanded else "▼ ") + self.title
-    
+
     def draw(self, screen, font, metrics=None):
         """Draw the panel and its contents.
-        
+
         Args:
             screen: Pygame surface to draw on
             font: Font to use for text
@@ -54,52 +200,83 @@ class CollapsiblePanel:
         """
         # Draw toggle button
         self.toggle_button.draw(screen, font)
-        
+
         if not self.is_expanded or metrics is None:
             return
-        
+
         # Draw expanded panel background
-        panel_rect = pygame.Rect(self.x, self.y + 25, self.width, self.height - 25)
-        pygame.draw.rect(screen, (50, 50, 50), panel_rect)
-        pygame.draw.rect(screen, Color.BLACK, panel_rect, 2)
-        
+        pygame.draw.rect(screen, (50, 50, 50), self.panel_rect)
+        pygame.draw.rect(screen, Color.BLACK, self.panel_rect, 2)
+
         # Draw metrics
-        metric_font = pygame.font.Font(None, 16)
+        metric_font = _metric_font()
         y_offset = self.y + 35
         for metric_name, value in metrics.items():
             metric_text = f"{metric_name}: {value}"
             text_surface = metric_font.render(metric_text, True, Color.WHITE)
             screen.blit(text_surface, (self.x + 10, y_offset))
             y_offset += 20
-    
-    def update_hover(self, mouse_pos):
-        """Update button hover state."""
-        self.toggle_button.update_hover(mouse_pos)
-    
-    def is_toggle_clicked(self, mouse_pos):
-        """Check if toggle button was clicked."""
-        return self.toggle_button.is_clicked(mouse_pos)
 
 
 class SelectablePanel(CollapsiblePanel):
     """A retractable panel with selectable options (inherits from CollapsiblePanel)."""
-    
-    def __init__(self, x, y, width, height, title="Select", options=None):
+
+    def __init__(self, x, y, width, height, title="Select", options=None, on_select=None):
         """
         Args:
             x, y: Position
             width, height: Panel dimensions
             title: Panel title
             options: Dict of {option_key: {"name": str, "cost": int}}
+            on_select: Called with the option key when an option button is clicked
         """
-        super().__init__(x, y, width, height, title)
         self.options = options or {}
         self.selected_option = None
-        
-        # Create buttons for each option
-        self.option_buttons = {}
-        self._create_option_buttons()
-    
+        self.on_select = on_select
+        self._tree = None
+
+        # Option buttons are created on first use; the panel starts collapsed
+        self._option_buttons = None
+        super().__init__(x, y, width, height, title)
+
+    def _panel_rect(self):
+        return pygame.Rect(self.x, self.y + 25, self.width, 30 + len(self.options) * 40)
+
+    @property
+    def option_buttons(self):
+        if self._option_buttons is None:
+            self._option_buttons = {}
+            self._create_option_buttons()
+        return self._option_buttons
+
+    def attach(self, tree):
+        super().attach(tree)
+        self._tree = tree
+        for button in (self._option_buttons or {}).values():
+            tree.add(button)
+
+    def set_visible(self, visible):
+        super().set_visible(visible)
+        for button in (self._option_buttons or {}).values():
+            button.set_visible(visible and self.is_expanded)
+
+    def move_to(self, x, y):
+        super().move_to(x, y)
+        for index, button in enumerate((self._option_buttons or {}).values()):
+            button.move_to(self.x + 5, self.y + 30 + index * 40)
+
+    def toggle(self):
+        super().toggle()
+        if self.is_expanded:
+            self.option_buttons  # Build (and register) on first expand
+        for button in (self._option_buttons or {}).values():
+            button.set_visible(self.is_expanded and self.toggle_button.visible)
+
+    def _select(self, option_key):
+        self.selected_option = option_key
+        if self.on_select is not None:
+            self.on_select(option_key)
+
     def _create_option_buttons(self):
         """Create clickable buttons for each option."""
         button_y = self.y + 30
@@ -113,42 +290,69 @@ class SelectablePanel(CollapsiblePanel):
                 button_height,
                 button_text,
                 (100, 100, 100),
-                Color.WHITE
+                Color.WHITE,
+                on_click=lambda key=option_key: self._select(key),
             )
-            self.option_buttons[option_key] = button
+            button.visible = self.is_expanded
+            self._option_buttons[option_key] = button
+            if self._tree is not None:
+                self._tree.add(button)
             button_y += button_height + 5
-    
+
     def draw(self, screen, font):
         """Draw the panel and its options. Overrides parent to show buttons instead of metrics."""
         # Draw toggle button
         self.toggle_button.draw(screen, font)
-        
+
         if not self.is_expanded:
             return
-        
+
         # Draw expanded panel background
-        panel_height = 30 + len(self.option_buttons) * 40
-        panel_rect = pygame.Rect(self.x, self.y + 25, self.width, panel_height)
-        pygame.draw.rect(screen, (50, 50, 50), panel_rect)
-        pygame.draw.rect(screen, Color.BLACK, panel_rect, 2)
-        
+        pygame.draw.rect(screen, (50, 50, 50), self.panel_rect)
+        pygame.draw.rect(screen, Color.BLACK, self.panel_rect, 2)
+
         # Draw option buttons
         for button in self.option_buttons.values():
             button.draw(screen, font)
-    
-    def update_hover(self, mouse_pos):
-        """Update button hover states. Overrides parent to include option buttons."""
-        self.toggle_button.update_hover(mouse_pos)
-        if self.is_expanded:
-            for button in self.option_buttons.values():
-                button.update_hover(mouse_pos)
-    
-    def get_clicked_option(self, mouse_pos):
-        """Return option key if an option was clicked, None otherwise."""
-        if not self.is_expanded:
-            return None
-        for option_key, button in self.option_buttons.items():
-            if button.is_clicked(mouse_pos):
-                return option_key
-        return None
 
+
+class SparklinePanel(CollapsiblePanel):
+    """A retractable panel that plots small line graphs (inherits from CollapsiblePanel)."""
+
+    ROW_HEIGHT = 34
+
+    def draw(self, screen, font, series=None):
+        """Draw the panel and one sparkline per series.
+
+        Args:
+            screen: Pygame surface to draw on
+            font: Font to use for text
+            series: Dict of label -> sequence of values (oldest first)
+        """
+        self.toggle_button.draw(screen, font)
+
+        if not self.is_expanded or series is None:
+            return
+
+        pygame.draw.rect(screen, (50, 50, 50), self.panel_rect)
+        pygame.draw.rect(screen, Color.BLACK, self.panel_rect, 2)
+
+        graph_x = self.x + 10
+        graph_w = self.width - 20
+        y_offset = self.y + 30
+        for label, values in series.items():
+            latest = values[-1] if len(values) else 0.0
+            text_surface = font.render(f"{label}: {latest:.1f}", True, Color.WHITE)
+            screen.blit(text_surface, (graph_x, y_offset))
+            graph_top = y_offset + 14
+            graph_h = self.ROW_HEIGHT - 18
+            if len(values) >= 2:
+                low = min(values)
+                span = (max(values) - low) or 1.0
+                step = graph_w / (len(values) - 1)
+                points = [
+                    (graph_x + i * step, graph_top + graph_h - (v - low) / span * graph_h)
+                    for i, v in enumerate(values)
+                ]
+                pygame.draw.lines(screen, Color.LIGHT_GREEN, False, points)
+            y_offset += self.ROW_HEIGHT
@@ -0,0 +1,182 @@
+"""Weather: precomputed noise fields that drive coop modifiers and the cloud/rain overlay."""
+import math
+import numpy as np
+import pygame
+from Constants import WeatherConstants
+from Camera import world_to_grid_many
+
+
+def tileable_noise(shape, smoothness, rng):
+    """Smooth noise that wraps on every axis, normalized to [0, 1].
+
+    White noise is low-pass filtered in the frequency domain, which makes the result
+    periodic by construction, so lookups can wrap indices with a modulo.
+    """
+    white = rng.standard_normal(shape)
+    freqs = np.meshgrid(*(np.fft.fftfreq(n) * n / s for n, s in zip(shape, smoothness)), indexing="ij")
+    falloff = np.exp(-sum(f ** 2 for f in freqs))
+    field = np.real(np.fft.ifftn(np.fft.fftn(white) * falloff))
+    field -= field.min()
+    return field / max(field.max(), 1e-12)
+
+
+class WeatherSystem:
+    """Cloud, rain and temperature sampled per land as a pure function of (row, col, game_time).
+
+    Each field is a (TIME_FRAMES, PERIOD, PERIOD) array generated once; the farm sees it
+    tiled every PERIOD lands and looping every CYCLE_LENGTH game seconds. Sampling is an
+    indexed lookup, so the simulation thread and the renderer agree without sharing state.
+
+    Coop modifiers are refreshed for every coop in one batched lookup each UPDATE_INTERVAL
+    game seconds rather than per coop per tick.
+    """
+
+    def __init__(self, seed=None):
+        rng = np.random.default_rng(seed)
+        shape = (WeatherConstants.TIME_FRAMES, WeatherConstants.PERIOD, WeatherConstants.PERIOD)
+        smoothness = (WeatherConstants.TIME_SMOOTHNESS, WeatherConstants.SPACE_SMOOTHNESS, WeatherConstants.SPACE_SMOOTHNESS)
+        self.cloud = tileable_noise(shape, smoothness, rng)
+        # Rain only falls under heavy cloud
+        self.rain = np.clip((self.cloud - WeatherConstants.RAIN_CLOUD_THRESHOLD)
+                            / (1.0 - WeatherConstants.RAIN_CLOUD_THRESHOLD), 0.0, 1.0)
+        self.temperature = tileable_noise(shape, smoothness, rng) * 2.0 - 1.0  # -1 cold .. 1 hot
+        self._next_update = 0.0
+        self._streaks = None
+        self._intensity = (None, None)
+        self._intensity_key = None
+        self._overlay = None
+        self._rain_buffer = None
+
+    @staticmethod
+    def frame_index(game_time):
+        frames = WeatherConstants.TIME_FRAMES
+        return int(game_time / WeatherConstants.CYCLE_LENGTH * frames) % frames
+
+    def sample(self, rows, cols, game_time):
+        """Return (cloud, rain, temperature) arrays for the given land rows and cols."""
+        t = self.frame_index(game_time)
+        r = np.asarray(rows, dtype=np.int64) % WeatherConstants.PERIOD
+        c = np.asarray(cols, dtype=np.int64) % WeatherConstants.PERIOD
+        return self.cloud[t, r, c], self.rain[t, r, c], self.temperature[t, r, c]
+
+    @staticmethod
+    def modifiers(rain, temperature):
+        """Production and blight multipliers for sampled weather."""
+        production = (1.0
+                      - WeatherConstants.HEAT_PRODUCTION_PENALTY * np.maximum(temperature, 0.0)
+                      - WeatherConstants.COLD_PRODUCTION_PENALTY * np.maximum(-temperature, 0.0))
+        blight = 1.0 + WeatherConstants.RAIN_BLIGHT_BONUS * rain
+        return production, blight
+
+    def update_coops(self, lands, game_time):
+        """Refresh weather modifiers on every coop when due. Returns True if they were refreshed."""
+        if game_time < self._next_update:
+            return False
+        self._next_update = game_time + WeatherConstants.UPDATE_INTERVAL
+        coop_lands = [land for land in lands if land.coop]
+        if not coop_lands:
+            return True
+        rows = [land.row for land in coop_lands]
+        cols = [land.col for land in coop_lands]
+        _, rain, temperature = self.sample(rows, cols, game_time)
+        production, blight = self.modifiers(rain, temperature)
+        for land, p, b in zip(coop_lands, production.tolist(), blight.tolist()):
+            land.coop.weather_production = p
+            land.coop.weather_blight = b
+            land.coop.version += 1
+        return True
+
+    def _streak_sheet(self, size):
+        """Surface-sized (plus one tile) sheet of white rain streaks, drawn once per size and scrolled."""
+        tile = WeatherConstants.STREAK_TILE
+        if self._streaks is None or self._streaks.get_size() != (size[0] + tile, size[1] + tile):
+            sheet = pygame.Surface((size[0] + tile, size[1] + tile), pygame.SRCALPHA)
+            sheet.fill((255, 255, 255, 0))
+            rng = np.random.default_rng(0)
+            length = WeatherConstants.STREAK_LENGTH
+            for _ in range(sheet.get_width() * sheet.get_height() // (tile * tile) * WeatherConstants.STREAKS_PER_TILE):
+                x = int(rng.integers(sheet.get_width()))
+                y = int(rng.integers(sheet.get_height()))
+                pygame.draw.line(sheet, (255, 255, 255, 255), (x, y), (x - length // 3, y + length))
+            self._streaks = sheet
+        return self._streaks
+
+    def _intensity_surfaces(self, camera, game_time):
+        """Padded cloud and rain intensity surfaces and the screen position of their top-left corner.
+
+        The surfaces cover the view plus OVERLAY_PAD pixels and are anchored to world space
+        (zoomed world coordinates snapped to multiples of OVERLAY_PAD). Panning only moves the
+        returned origin; they are rebuilt when the zoom, size or weather frame changes or the
+        view crosses a pad boundary.
+        """
+        pad = WeatherConstants.OVERLAY_PAD
+        zoom = camera.zoom
+        matrix = camera.get_matrix()
+        tx, ty = matrix[0, 2], matrix[1, 2]  # Screen position of the world origin
+        # Zoomed-world position of the padded region's corner
+        u0 = math.floor(-tx / pad) * pad
+        v0 = math.floor(-ty / pad) * pad
+        size = (camera.width + pad, camera.height + pad)
+        key = (zoom, size, self.frame_index(game_time), u0, v0)
+        origin = (int(math.floor(u0 + tx)), int(math.floor(v0 + ty)))
+        if key == self._intensity_key:
+            return self._intensity[0], self._intensity[1], origin
+        self._intensity_key = key
+
+        scale = WeatherConstants.OVERLAY_SCALE
+        width = max(1, size[0] // scale)
+        height = max(1, size[1] // scale)
+        # Sample the centre of each low-resolution pixel; arrays are indexed [x, y] like surfarray
+        us, vs = np.meshgrid(u0 + np.arange(width) * scale + scale / 2, v0 + np.arange(height) * scale + scale / 2, indexing="ij")
+        world_points = np.stack((us.ravel(), vs.ravel()), axis=1) / zoom
+        grid = np.floor(world_to_grid_many(world_points))
+        cloud, rain, _ = self.sample(grid[:, 0], grid[:, 1], game_time)
+        cover = np.clip((cloud - WeatherConstants.CLOUD_THRESHOLD) / (1.0 - WeatherConstants.CLOUD_THRESHOLD), 0.0, 1.0)
+
+        self._intensity = (
+            self._upscale(cover.reshape(width, height) * WeatherConstants.CLOUD_ALPHA, WeatherConstants.CLOUD_COLOR, size),
+            self._upscale(rain.reshape(width, height) * WeatherConstants.RAIN_ALPHA, WeatherConstants.RAIN_COLOR, size),
+        )
+        return self._intensity[0], self._intensity[1], origin
+
+    @staticmethod
+    def _upscale(alpha, colour, size):
+        """Fill a low-resolution surface with colour and per-pixel alpha via surfarray, then smooth it to size."""
+        if not alpha.any():
+            return None
+        small = pygame.Surface(alpha.shape, pygame.SRCALPHA)
+        small.fill(colour)
+        pixels_alpha = pygame.surfarray.pixels_alpha(small)
+        pixels_alpha[...] = alpha.astype(np.uint8)
+        del pixels_alpha  # Unlock the surface before scaling
+        return pygame.transform.smoothscale(small, size)
+
+    def render_overlay(self, camera, game_time):
+        """Return an SRCALPHA surface of clouds and rain the size of camera's target, or None in clear weather.
+
+        Cloud and rain intensity are computed at 1/OVERLAY_SCALE resolution and cached; each
+        frame the visible part is cropped out at the current pan, and while raining the rain
+        intensity is masked with the scrolled streak sheet (a BLEND_RGBA_MULT blit) and
+        composited over the clouds.
+        """
+        clouds, rain, (ox, oy) = self._intensity_surfaces(camera, game_time)
+        size = (camera.width, camera.height)
+        view = pygame.Rect(-ox, -oy, *size)
+        if rain is None:
+            # A subsurface is a view into the cached pixels, not a copy
+            return clouds.subsurface(view) if clouds is not None else None
+        if self._overlay is None or self._overlay.get_size() != size:
+            self._overlay = pygame.Surface(size, pygame.SRCALPHA)
+            self._rain_buffer = pygame.Surface(size, pygame.SRCALPHA)
+        # BLEND_RGBA_MAX onto a cleared surface is an exact copy (a normal blit would premultiply)
+        self._overlay.fill((0, 0, 0, 0))
+        if clouds is not None:
+            self._overlay.blit(clouds, (0, 0), view, special_flags=pygame.BLEND_RGBA_MAX)
+        self._rain_buffer.fill((0, 0, 0, 0))
+        self._rain_buffer.blit(rain, (0, 0), view, special_flags=pygame.BLEND_RGBA_MAX)
+        tile = WeatherConstants.STREAK_TILE
+        offset = int(game_time * WeatherConstants.RAIN_SCROLL_SPEED) % tile
+        self._rain_buffer.blit(self._streak_sheet(size), (0, 0), pygame.Rect(offset // 3, tile - offset, *size),
+                               special_flags=pygame.BLEND_RGBA_MULT)
+        self._overlay.blit(self._rain_buffer, (0, 0))
+        return self._overlay
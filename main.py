@@ -1,10 +1,73 @@
+import time
+_import_started = time.perf_counter()
+from Profiling import STARTUP_TRACE, MEMORY_MONITOR
 from Game import Game
+from Automation import default_rules
+from Server import serve_in_background
+import argparse
+import os
+import sys
 import pygame
+STARTUP_TRACE.record("imports", since=_import_started)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Eggonomics - chicken coop tycoon")
+    parser.add_argument("--threaded", action="store_true",
+                        help="run the simulation on a worker thread at a fixed tick rate")
+    parser.add_argument("--tick-rate", type=int, default=60,
+                        help="simulation ticks per second")
+    parser.add_argument("--automation", action="store_true",
+                        help="install the preset auto-feed, auto-sell and auto-cure rules")
+    parser.add_argument("--metrics-export", metavar="PATH", default=None,
+                        help="on exit, write recorded metrics to PATH (.csv, otherwise .npz)")
+    parser.add_argument("--serve", metavar="PORT", type=int, default=None,
+                        help="accept commands and stream state on localhost:PORT (implies --threaded)")
+    parser.add_argument("--fps-cap", type=int, default=None,
+                        help="maximum frames per second")
+    parser.add_argument("--power-saver", action="store_true",
+                        help="lower frame rates for always-on or battery-powered displays")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="render the map at this fraction of the window resolution (UI stays native)")
+    parser.add_argument("--target-frame-ms", type=float, default=None,
+                        help="adjust the render scale automatically to keep frame work time under this")
+    parser.add_argument("--memory-trace", action="store_true",
+                        help="track memory, surface allocations and gc pauses (F3 toggles the overlay)")
+    parser.add_argument("--startup-check", action="store_true",
+                        help="start headless, draw one frame, print the startup trace and exit; exits 1 if "
+                             "the first frame exceeds EGGONOMICS_STARTUP_BUDGET_MS (default 1000)")
+    return parser.parse_args()
 
 def main():
-    pygame.init()
-    game = Game()
+    args = parse_args()
+    if args.startup_check:
+        # Must be set before the display is initialised
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        STARTUP_TRACE.enabled = True
+    with STARTUP_TRACE.stage("pygame.init"):
+        pygame.init()
+    if args.memory_trace or MEMORY_MONITOR.enabled:
+        MEMORY_MONITOR.start()
+    game = Game(
+        threaded_simulation=args.threaded or args.serve is not None,
+        tick_rate=args.tick_rate,
+        pacing_profile="power_saver" if args.power_saver else "default",
+        fps_cap=args.fps_cap,
+        render_scale=args.render_scale,
+        target_frame_ms=args.target_frame_ms,
+    )
+    if args.automation:
+        for rule in default_rules():
+            game.rules.add_rule(rule)
+    if args.startup_check:
+        game.draw(game)
+        STARTUP_TRACE.first_frame()
+        pygame.quit()
+        sys.exit(1 if STARTUP_TRACE.over_budget() else 0)
+    if args.serve is not None:
+        serve_in_background(game, port=args.serve)
     game.run()
+    if args.metrics_export:
+        game.metrics.export(args.metrics_export)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()